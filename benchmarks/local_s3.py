@@ -0,0 +1,93 @@
+# =============================================================================
+# 로컬 디렉터리 기반 S3 대체 클라이언트 (벤치마크용)
+# =============================================================================
+# boto3 S3 클라이언트 중 앱이 쓰는 메서드만 구현
+#   get_object (IfNoneMatch -> 304, Range), head_object, put_object
+# {root}/{bucket}/{key} 파일을 객체로 취급, ETag 는 본문 MD5
+
+import hashlib
+import io
+import os
+import threading
+
+from botocore.exceptions import ClientError
+
+
+class _Body(io.BytesIO):
+
+    def iter_chunks(self, chunk_size=1024 * 1024):
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _error(code, status, operation):
+    return ClientError(
+        {'Error': {'Code': code, 'Message': code}, 'ResponseMetadata': {'HTTPStatusCode': status}},
+        operation
+    )
+
+
+class LocalS3Client:
+
+    def __init__(self, root, latency=0.0):
+        # latency: 요청당 인위적 지연(초) - 네트워크 왕복 흉내
+        self.root = root
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.request_counts = {"get": 0, "head": 0, "put": 0, "not_modified": 0}
+        self.bytes_sent = 0
+
+    def _path(self, bucket, key):
+        return os.path.join(self.root, bucket, *key.split('/'))
+
+    def _read(self, bucket, key, operation):
+        path = self._path(bucket, key)
+        if not os.path.isfile(path):
+            raise _error('NoSuchKey' if operation == 'GetObject' else '404', 404, operation)
+        with open(path, 'rb') as f:
+            body = f.read()
+        return body, '"%s"' % hashlib.md5(body).hexdigest()
+
+    def _count(self, name, nbytes=0):
+        with self._lock:
+            self.request_counts[name] += 1
+            self.bytes_sent += nbytes
+
+    def _wait(self):
+        if self.latency:
+            threading.Event().wait(self.latency)
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None, Range=None, **kwargs):
+        self._wait()
+        body, etag = self._read(Bucket, Key, 'GetObject')
+        if IfNoneMatch is not None and IfNoneMatch == etag:
+            self._count("not_modified")
+            raise _error('304', 304, 'GetObject')
+
+        if Range:
+            start, _, end = Range.replace('bytes=', '').partition('-')
+            body = body[int(start):int(end) + 1 if end else None]
+
+        self._count("get", len(body))
+        return {'Body': _Body(body), 'ETag': etag, 'ContentLength': len(body)}
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self._wait()
+        body, etag = self._read(Bucket, Key, 'HeadObject')
+        self._count("head")
+        return {'ETag': etag, 'ContentLength': len(body)}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if hasattr(Body, 'read'):
+            Body = Body.read()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(Body)
+        os.replace(tmp_path, path)
+        self._count("put")
+        return {'ETag': '"%s"' % hashlib.md5(Body).hexdigest()}
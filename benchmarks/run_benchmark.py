@@ -0,0 +1,231 @@
+# =============================================================================
+# 오프라인 성능 벤치마크
+# =============================================================================
+# 실행: python -m benchmarks.run_benchmark [--clusters 4] [--rows 20000] [--runs 3] [--storage s3|local|arrow]
+# - 합성 매핑 / 클러스터 parquet / 모델을 임시 디렉터리에 생성
+# - 네트워크 / 자격 증명 없이 앱 전체를 실행
+#   s3: LocalS3Client 를 주입해 S3 백엔드(디스크 미러, ETag) 경로까지 측정
+#   local / arrow: 같은 디렉터리를 로컬 저장소 백엔드로 직접 사용
+# - --ipc-cache: 호스트 공용 IPC 캐시 사용 (cold 실행 사이에도 유지 = 새 프로세스 기동 상황)
+# - AppTest 로 home, TOP_3 페이지를 구동해 cold / warm 지연 시간,
+#   최대 메모리, 단계별 시간(metrics) 을 JSON 으로 출력
+#   - rss_peak_mb / rss_delta_mb: 실행 중 샘플링한 RSS (Arrow / CatBoost 네이티브 메모리 포함)
+#   - tracemalloc_peak_mb: 파이썬 힙만 (참고용)
+#
+# cold: 프로세스 내 캐시 + 디스크 미러를 모두 비운 직후 페이지 첫 실행
+#       (사이드바 구성을 위한 메인 스크립트 실행 뒤에 비우므로 home 이 채운 캐시를 쓰지 않음)
+# warm: 같은 세션에서 HIGHLIGHT 를 바꿔 가며 재실행
+
+import argparse
+import json
+import logging
+import glob
+import os
+import resource
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.local_s3 import LocalS3Client
+from benchmarks.synthetic_data import generate
+from utils.cache import cluster_cache
+from utils.disk_cache import disk_mirror
+from utils.ipc_cache import host_cache
+from utils.metrics import metrics
+from utils.recommend import HIGHLIGHT_WEIGHTS
+from utils.s3_client import BUCKET_NAME, set_s3_client
+from utils.storage import IPC_SUFFIX, create_storage, set_storage
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(APP_ROOT, "main.py")
+PAGES = ["pages/home.py", "pages/TOP_3.py"]
+
+
+def reset_caches(backend, data_root, mirror_root):
+    # cold 실행 조건: st 캐시, 바이트 LRU, 디스크 미러 / IPC 파일, 지표 초기화
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    cluster_cache.clear()
+    shutil.rmtree(mirror_root, ignore_errors=True)
+    disk_mirror.reset(mirror_root)
+    for path in glob.glob(os.path.join(data_root, "**", "*" + IPC_SUFFIX), recursive=True):
+        os.remove(path)
+    set_storage(create_storage(backend, root=data_root))
+    metrics.reset()
+
+
+def _current_rss():
+    # 현재 RSS (바이트) - Linux /proc, 없으면 프로세스 최대 RSS 로 대체
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RssSampler:
+    # 실행 중 RSS 를 주기적으로 읽어 최대값 기록 (tracemalloc 이 못 보는 네이티브 할당 포함)
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.baseline = self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _current_rss())
+
+    def __enter__(self):
+        self.baseline = self.peak = _current_rss()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _current_rss())
+
+
+def _summarize(values):
+    values = np.asarray(values) * 1000
+    return {
+        "runs": len(values),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "max_ms": round(float(values.max()), 3),
+        "min_ms": round(float(values.min()), 3),
+    }
+
+
+def _run_app(app, timeout):
+    start = time.perf_counter()
+    app.run(timeout=timeout)
+    elapsed = time.perf_counter() - start
+    if app.exception:
+        raise RuntimeError(f"app raised: {[e.value for e in app.exception]}")
+    if app.error:
+        raise RuntimeError(f"app error: {[e.value for e in app.error]}")
+    return elapsed
+
+
+def bench_page(page, backend, data_root, mirror_root, runs, warm_runs, timeout):
+    cold, warm = [], []
+    rss_peak = rss_delta = 0
+    tracemalloc.start()
+    for _ in range(runs):
+        app = AppTest.from_file(MAIN_SCRIPT, default_timeout=timeout)
+        # 사이드바 기본값 구성을 위해 메인 스크립트 한 번 실행 (기본 페이지 home 이 캐시를 채우므로
+        # 측정 전에 다시 비운다) 후 페이지 전환
+        app.run(timeout=timeout)
+        app.switch_page(page)
+        reset_caches(backend, data_root, mirror_root)
+
+        with RssSampler() as rss:
+            cold.append(_run_app(app, timeout))
+
+            highlights = list(HIGHLIGHT_WEIGHTS)
+            for i in range(warm_runs):
+                app.session_state['selected_highlight'] = highlights[i % len(highlights)]
+                warm.append(_run_app(app, timeout))
+        rss_peak = max(rss_peak, rss.peak)
+        rss_delta = max(rss_delta, rss.peak - rss.baseline)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "cold": _summarize(cold),
+        "warm": _summarize(warm) if warm else None,
+        "rss_peak_mb": round(rss_peak / 1024 ** 2, 2),
+        "rss_delta_mb": round(rss_delta / 1024 ** 2, 2),
+        "tracemalloc_peak_mb": round(peak / 1024 ** 2, 2),
+        "metrics": metrics.snapshot(),
+    }
+
+
+def run(n_clusters=4, n_rows=20000, runs=3, warm_runs=5, latency=0.0,
+        iterations=30, timeout=120, work_dir=None, backend="s3", ipc_cache=False):
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="ive_bench_")
+    try:
+        bucket_root = os.path.join(work_dir, "s3")
+        data_root = os.path.join(bucket_root, BUCKET_NAME)
+        mirror_root = os.path.join(work_dir, "mirror")
+        host_cache.enabled = ipc_cache
+        host_cache.root = os.path.join(work_dir, "ipc")
+
+        start = time.perf_counter()
+        clusters = generate(data_root, n_clusters=n_clusters, n_rows=n_rows, iterations=iterations)
+        logger.info("generated %d clusters x %d rows in %.1fs",
+                    len(clusters), n_rows, time.perf_counter() - start)
+
+        client = LocalS3Client(bucket_root, latency=latency)
+        set_s3_client(client)
+
+        # AppTest 는 작업 디렉터리 기준으로 pages/ 를 찾는다
+        cwd = os.getcwd()
+        os.chdir(APP_ROOT)
+        try:
+            pages = {
+                page: bench_page(page, backend, data_root, mirror_root, runs, warm_runs, timeout)
+                for page in PAGES
+            }
+        finally:
+            os.chdir(cwd)
+
+        return {
+            "config": {
+                "storage": backend, "ipc_cache": ipc_cache, "clusters": n_clusters, "rows": n_rows, "runs": runs,
+                "warm_runs": warm_runs, "latency_s": latency,
+            },
+            "pages": pages,
+            "s3_requests": dict(client.request_counts, bytes=client.bytes_sent),
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 2),
+        }
+    finally:
+        set_storage(None)
+        set_s3_client(None)
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 데이터 + 로컬 S3 기반 페이지 성능 측정")
+    parser.add_argument("--clusters", type=int, default=4, help="클러스터 수")
+    parser.add_argument("--rows", type=int, default=20000, help="클러스터당 행 수")
+    parser.add_argument("--runs", type=int, default=3, help="페이지별 cold 실행 횟수")
+    parser.add_argument("--warm-runs", type=int, default=5, help="cold 실행마다 이어지는 warm 재실행 횟수")
+    parser.add_argument("--storage", choices=["s3", "local", "arrow"], default="s3", help="저장소 백엔드")
+    parser.add_argument("--ipc-cache", action="store_true", help="호스트 공용 Arrow IPC 캐시 사용")
+    parser.add_argument("--latency", type=float, default=0.0, help="S3 요청당 인위적 지연(초, s3 백엔드)")
+    parser.add_argument("--iterations", type=int, default=30, help="합성 CatBoost 모델 반복 수")
+    parser.add_argument("--work-dir", help="생성 데이터를 남길 디렉터리 (기본: 임시 디렉터리 후 삭제)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    report = run(
+        n_clusters=args.clusters, n_rows=args.rows, runs=args.runs, warm_runs=args.warm_runs,
+        latency=args.latency, iterations=args.iterations, work_dir=args.work_dir,
+        backend=args.storage, ipc_cache=args.ipc_cache
+    )
+
+    text = json.dumps(report, ensure_ascii=False, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        logger.info("wrote %s", args.output)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
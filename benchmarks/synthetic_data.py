@@ -0,0 +1,89 @@
+# =============================================================================
+# 벤치마크용 합성 데이터 / 모델 생성
+# =============================================================================
+# 실제 버킷과 같은 키 구조(utils/keys.py)로 root 아래에 저장
+#   - 매핑 parquet (INDUSTRY/OS_TYPE/LIMIT_TYPE -> GMM_CLUSTER)
+#   - 클러스터별 IVE_ANALYTICS_CLUSTER_{n}.parquet
+#   - 클러스터별 CatBoost 모델 pickle (CVR, 1000_W_EFFICIENCY 는 모델, ATS 는 상수)
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoostRegressor
+
+from utils.keys import MAPPING_KEY, cluster_data_key, cluster_model_key
+from utils.recommend import FEATURE_COLUMNS
+
+INDUSTRIES = ["금융/보험", "커머스/유통", "서비스", "게임", "교육/공공", "뷰티/헬스", "F&B/식품", "가전/제조"]
+OS_TYPES = ["web", "android", "ios"]
+LIMIT_TYPES = ["UNLIMITED", "LIMITED"]
+START_TIMES = ["새벽", "아침", "점심", "오후", "저녁", "심야"]
+
+
+def _write_parquet(df, root, key):
+    path = os.path.join(root, *key.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_parquet(path, engine='pyarrow', index=False)
+
+
+def make_mapping(n_clusters, rng):
+    rows = [
+        (industry, os_type, limit_type, int(rng.integers(n_clusters)))
+        for industry in INDUSTRIES for os_type in OS_TYPES for limit_type in LIMIT_TYPES
+    ]
+    mapping_df = pd.DataFrame(rows, columns=['INDUSTRY', 'OS_TYPE', 'LIMIT_TYPE', 'GMM_CLUSTER'])
+    # 모든 클러스터가 최소 한 번은 등장하도록
+    mapping_df.loc[:n_clusters - 1, 'GMM_CLUSTER'] = np.arange(min(n_clusters, len(mapping_df)))
+    return mapping_df
+
+
+def make_cluster_frame(cluster_n, n_rows, n_shapes, n_mda, rng):
+    return pd.DataFrame({
+        'INDUSTRY': rng.choice(INDUSTRIES, n_rows),
+        'OS_TYPE': rng.choice(OS_TYPES, n_rows),
+        'LIMIT_TYPE': rng.choice(LIMIT_TYPES, n_rows),
+        '1000_W_EFFICIENCY': rng.gamma(2.0, 300.0, n_rows),
+        'CVR': rng.beta(2.0, 20.0, n_rows),
+        'ATS': rng.beta(5.0, 5.0, n_rows),
+        'SHAPE': rng.choice([f"SHAPE_{i}" for i in range(n_shapes)], n_rows),
+        'MDA': rng.integers(0, n_mda, n_rows),
+        'START_TIME': rng.choice(START_TIMES, n_rows),
+        'TIME_TURN': rng.gamma(2.0, 2.0, n_rows),
+        'GMM_CLUSTER': cluster_n,
+    })
+
+
+def make_models(df, iterations):
+    features = df[FEATURE_COLUMNS]
+    models = {}
+    for target in ['CVR', '1000_W_EFFICIENCY']:
+        model = CatBoostRegressor(
+            iterations=iterations, depth=4, verbose=0,
+            cat_features=list(range(len(FEATURE_COLUMNS))), thread_count=1,
+            allow_writing_files=False
+        )
+        model.fit(features, df[target])
+        models[target] = model
+    models['ATS'] = float(df['ATS'].mean())
+    return models
+
+
+def generate(root, n_clusters=4, n_rows=20000, n_shapes=8, n_mda=40, iterations=30, seed=0):
+    # root 아래에 {key} 구조로 저장, 생성한 클러스터 목록 반환
+    rng = np.random.default_rng(seed)
+
+    mapping_df = make_mapping(n_clusters, rng)
+    _write_parquet(mapping_df, root, MAPPING_KEY)
+
+    for cluster_n in range(n_clusters):
+        df = make_cluster_frame(cluster_n, n_rows, n_shapes, n_mda, rng)
+        _write_parquet(df, root, cluster_data_key(cluster_n))
+
+        path = os.path.join(root, *cluster_model_key(cluster_n).split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(make_models(df, iterations), f)
+
+    return sorted(mapping_df['GMM_CLUSTER'].unique().tolist())
@@ -0,0 +1,92 @@
+# =============================================================================
+# 클러스터별 parquet -> 단일 데이터셋 변환 배치
+# =============================================================================
+# 실행: python -m jobs.build_cluster_dataset [--layout partitioned|sorted] [--key 저장소키]
+# - partitioned: {key}/GMM_CLUSTER={n}/part-0.parquet (hive 파티션)
+# - sorted     : GMM_CLUSTER 정렬 단일 파일, 클러스터마다 별도 row group
+# 생성 후 IVE_CLUSTER_DATASET={key} 로 앱 / 배치에서 사용
+
+import argparse
+import logging
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.data_loader import TARGET_COLUMNS, fetch_mapping_data
+from utils.keys import DEFAULT_DATASET_KEY, cluster_data_key
+from utils.mapping_index import MappingIndex
+from utils.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def read_cluster_table(cluster_n):
+    # 원본 클러스터 파일 (GMM_CLUSTER 는 파일 번호로 통일)
+    table, _ = get_storage().read_table(cluster_data_key(cluster_n), columns=TARGET_COLUMNS)
+    table = table.drop_columns(['GMM_CLUSTER'])
+    return table.append_column('GMM_CLUSTER', pa.array([int(cluster_n)] * table.num_rows, pa.int32()))
+
+
+def write_partitioned(clusters, root, filesystem):
+    for cluster_n in clusters:
+        table = read_cluster_table(cluster_n)
+        ds.write_dataset(
+            table,
+            root,
+            filesystem=filesystem,
+            format='parquet',
+            partitioning=ds.partitioning(pa.schema([('GMM_CLUSTER', pa.int32())]), flavor='hive'),
+            basename_template='part-{i}.parquet',
+            existing_data_behavior='delete_matching',
+        )
+        logger.info("cluster %s: %d rows", cluster_n, table.num_rows)
+
+
+def write_sorted(clusters, path, filesystem):
+    writer = None
+    try:
+        for cluster_n in sorted(clusters):
+            table = read_cluster_table(cluster_n)
+            if writer is None:
+                writer = pq.ParquetWriter(
+                    path, table.schema, filesystem=filesystem, compression='zstd'
+                )
+            # write_table 호출마다 row group 이 끊기므로 클러스터가 섞이지 않는다
+            writer.write_table(table)
+            logger.info("cluster %s: %d rows", cluster_n, table.num_rows)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def run(clusters=None, layout="partitioned", key=None):
+    if clusters is None:
+        clusters = MappingIndex(fetch_mapping_data()).clusters
+
+    if key is None:
+        key = DEFAULT_DATASET_KEY + (".parquet" if layout == "sorted" else "")
+    storage = get_storage()
+    filesystem, base = storage.arrow_filesystem()
+    target = f"{base}/{key}"
+
+    if layout == "sorted":
+        write_sorted(clusters, target, filesystem)
+    else:
+        write_partitioned(clusters, target, filesystem)
+    logger.info("wrote %s (IVE_CLUSTER_DATASET=%s)", storage.location(key), key)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="클러스터 parquet -> 단일 데이터셋 변환")
+    parser.add_argument("--clusters", type=int, nargs="*", help="대상 클러스터 (기본: 전체)")
+    parser.add_argument("--layout", choices=["partitioned", "sorted"], default="partitioned")
+    parser.add_argument("--key", help=f"저장할 저장소 키 (기본: {DEFAULT_DATASET_KEY})")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run(clusters=args.clusters or None, layout=args.layout, key=args.key)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# =============================================================================
+# 클러스터 요약 통계 사이드카 생성 배치
+# =============================================================================
+# 실행: python -m jobs.build_summaries [--clusters 0 1 2]
+# 클러스터 parquet 옆에 IVE_ANALYTICS_CLUSTER_{n}_summary.json 업로드
+# (원본 적재 직후 실행하면 홈 페이지는 원본 행을 읽지 않고 렌더링)
+
+import argparse
+import json
+import logging
+
+from utils.data_loader import data_version, fetch_cluster_frames, fetch_mapping_data
+from utils.mapping_index import MappingIndex
+from utils.keys import cluster_summary_key
+from utils.storage import get_storage
+from utils.summary import compute_summary
+
+logger = logging.getLogger(__name__)
+
+
+def run(clusters=None):
+    if clusters is None:
+        clusters = MappingIndex(fetch_mapping_data()).clusters
+
+    for cluster_n, df in fetch_cluster_frames(clusters).items():
+        summary = compute_summary(df, data_version(cluster_n))
+        get_storage().put(
+            cluster_summary_key(cluster_n),
+            json.dumps(summary, ensure_ascii=False).encode('utf-8'),
+            content_type='application/json',
+        )
+        logger.info("cluster %s: %d rows summarised", cluster_n, summary['rows'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="클러스터 요약 통계 사이드카 생성")
+    parser.add_argument("--clusters", type=int, nargs="*", help="대상 클러스터 (기본: 전체)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run(clusters=args.clusters or None)
+
+
+if __name__ == "__main__":
+    main()
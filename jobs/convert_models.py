@@ -0,0 +1,63 @@
+# =============================================================================
+# 모델 pickle -> CatBoost 네이티브(cbm) 변환 배치
+# =============================================================================
+# 실행: python -m jobs.convert_models [--clusters 0 1 2] [--output-dir 경로]
+# - Cluster_{n}_cat_re_models.pkl 을 읽어 타깃별 cbm + manifest.json 으로 저장
+# - 상수 타깃은 manifest 안에 숫자로만 기록
+# - 저장소 업로드 시 cbm 을 먼저 올리고 manifest 를 마지막에 올린다
+
+import argparse
+import logging
+import os
+import pickle
+import tempfile
+
+from utils.data_loader import fetch_mapping_data
+from utils.keys import cluster_model_key, cluster_model_prefix
+from utils.mapping_index import MappingIndex
+from utils.model_io import save_model_bundle
+from utils.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def convert_cluster(cluster_n, out_dir):
+    storage = get_storage()
+    pickle_key = cluster_model_key(cluster_n)
+    with open(storage.path(pickle_key), 'rb') as f:
+        models = pickle.load(f)
+    return save_model_bundle(models, out_dir, source_etag=storage.cached_version(pickle_key))
+
+
+def run(clusters=None, output_dir=None):
+    if clusters is None:
+        clusters = MappingIndex(fetch_mapping_data()).clusters
+
+    for cluster_n in clusters:
+        if output_dir:
+            out_dir = os.path.join(output_dir, os.path.basename(cluster_model_prefix(cluster_n)))
+            convert_cluster(cluster_n, out_dir)
+            logger.info("cluster %s: wrote %s", cluster_n, out_dir)
+            continue
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            written = convert_cluster(cluster_n, out_dir)
+            prefix = cluster_model_prefix(cluster_n)
+            for file_name in written:
+                with open(os.path.join(out_dir, file_name), 'rb') as f:
+                    get_storage().put(f"{prefix}/{file_name}", f.read())
+        logger.info("cluster %s: uploaded %s/", cluster_n, get_storage().location(prefix))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="클러스터 모델 pickle -> CatBoost cbm 변환")
+    parser.add_argument("--clusters", type=int, nargs="*", help="대상 클러스터 (기본: 전체)")
+    parser.add_argument("--output-dir", help="저장소 대신 저장할 로컬 디렉터리")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run(clusters=args.clusters or None, output_dir=args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# =============================================================================
+# 추천 결과 사전 계산 배치
+# =============================================================================
+# 실행: python -m jobs.precompute_recommendations [--clusters 0 1 2] [--output 경로]
+# - 매핑 데이터의 모든 GMM_CLUSTER 에 대해 데이터 / 모델을 로드
+# - HIGHLIGHT("이익", "비용", "안정성")별 전체 순위 테이블 계산
+# - 원본 버전(ETag)을 기록한 단일 parquet 산출물을 저장소(또는 로컬 경로)에 저장
+
+import argparse
+import logging
+
+import pandas as pd
+
+from utils.data_loader import fetch_cluster_frames, fetch_mapping_data, fetch_model
+from utils.mapping_index import MappingIndex
+from utils.recommendation_store import (
+    RECOMMENDATION_KEY, build_cluster_recommendations, current_sources, to_artifact_bytes
+)
+from utils.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+
+def run(clusters=None, output=None):
+    if clusters is None:
+        clusters = MappingIndex(fetch_mapping_data()).clusters
+
+    # 단일 데이터셋이면 모든 클러스터를 한 번의 스캔으로 읽는다
+    cluster_frames = fetch_cluster_frames(clusters)
+
+    frames = []
+    sources = {}
+    for cluster_n in clusters:
+        df = cluster_frames[cluster_n]
+        model = fetch_model(cluster_n)
+        sources[int(cluster_n)] = current_sources(cluster_n)
+        frames.append(build_cluster_recommendations(cluster_n, df, model))
+        logger.info("cluster %s: %d candidates", cluster_n, len(frames[-1]) // 3)
+
+    body = to_artifact_bytes(pd.concat(frames, ignore_index=True), sources)
+
+    if output:
+        with open(output, 'wb') as f:
+            f.write(body)
+        logger.info("wrote %s (%d bytes)", output, len(body))
+    else:
+        storage = get_storage()
+        storage.put(RECOMMENDATION_KEY, body)
+        logger.info("uploaded %s (%d bytes)", storage.location(RECOMMENDATION_KEY), len(body))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="클러스터 x HIGHLIGHT 추천 결과 사전 계산")
+    parser.add_argument("--clusters", type=int, nargs="*", help="대상 클러스터 (기본: 전체)")
+    parser.add_argument("--output", help="저장소 대신 저장할 로컬 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run(clusters=args.clusters or None, output=args.output)
+
+
+if __name__ == "__main__":
+    main()
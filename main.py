@@ -1,6 +1,14 @@
+import os
+
+import pandas as pd
 import streamlit as st
 
-BUCKET_NAME = "ivekorea-airflow-practice-taeeunk"
+from utils.data_loader import load_mapping_index
+from utils.hot_reload import hot_reload_enabled, start_hot_reload
+from utils.mapping_index import INDUSTRY_OPTIONS, LIMIT_OPTIONS, OS_OPTIONS
+from utils.metrics import metrics
+from utils.recommend import HIGHLIGHT_WEIGHTS, normalize_weights
+from utils.warmup import start_warmup, warmup_enabled, warmup_status
 
 # =============================================================================
 # 앱 전체 설정
@@ -52,6 +60,17 @@ st.set_page_config(
 )
 
 
+# =============================================================================
+# 캐시 사전 로드 (IVE_WARMUP=1, 백그라운드)
+# =============================================================================
+if warmup_enabled():
+    start_warmup()
+
+# 원본 변경 감지 후 해당 클러스터만 교체 (IVE_HOT_RELOAD=1, 백그라운드)
+if hot_reload_enabled():
+    start_hot_reload()
+
+
 # =============================================================================
 # Session State 초기값 설정
 # =============================================================================
@@ -65,6 +84,10 @@ if 'selected_limited' not in st.session_state:
 if 'selected_highlight' not in st.session_state:
     st.session_state['selected_highlight'] = "이익"
 
+# 사용자가 저장한 가중치 프리셋 {이름: (CVR, EFF, ATS)}
+if 'weight_presets' not in st.session_state:
+    st.session_state['weight_presets'] = {}
+
 
 # =============================================================================
 # 페이지 정의 (st.Page)
@@ -82,6 +105,12 @@ viz_page = st.Page(
     icon="🔍"
 )
 
+compare_page = st.Page(
+    page="pages/compare.py",
+    title="시나리오 비교",
+    icon="🆚"
+)
+
 info_page = st.Page(
     page="pages/information.py",
     title="대시보드 소개",
@@ -93,7 +122,7 @@ info_page = st.Page(
 # 네비게이션 구성
 # =============================================================================
 pg = st.navigation({
-    "메인": [home_page, viz_page],
+    "메인": [home_page, viz_page, compare_page],
     "더보기": [info_page]
 })
 
@@ -101,38 +130,126 @@ pg = st.navigation({
 # =============================================================================
 # 사이드바
 # =============================================================================
+mapping_index = load_mapping_index()
+
+
+# 데이터가 없는 조합은 선택지에서 제외 (매핑을 못 불러오면 전체 표시)
+def available_options(options, key, *prefix):
+    if mapping_index is None:
+        return options
+
+    valid = [option for option in options if mapping_index.is_valid(*prefix, option)]
+    if not valid:
+        return options
+
+    if st.session_state.get(key) not in valid:
+        st.session_state[key] = valid[0]
+    return valid
+
+
 with st.sidebar:
     st.header("🔍 광고 옵션 선택")
 
     st.selectbox(
         "산업군", 
-        ["금융/보험", "커머스/유통","서비스", "게임", "교육/공공", "뷰티/헬스", "F&B/식품", "가전/제조"], 
+        available_options(INDUSTRY_OPTIONS, 'selected_industry'), 
         key='selected_industry'
     )
     
     st.selectbox(
         "OS 환경", 
-        ["WEB", "ANDROID", "IOS"], 
+        available_options(OS_OPTIONS, 'selected_os', st.session_state['selected_industry']), 
         key='selected_os'
     )
     
     st.selectbox(
         "목표 제한 여부", 
-        ["UNLIMITED", "LIMITED"], 
+        available_options(
+            LIMIT_OPTIONS, 'selected_limited',
+            st.session_state['selected_industry'], st.session_state['selected_os']
+        ), 
         key='selected_limited'
     )
 
+CUSTOM_HIGHLIGHT = "사용자 지정"
+
 with st.sidebar:
     st.header("🧐 무엇을 중점적으로?")
 
+    weight_presets = st.session_state['weight_presets']
     highlight_clean = st.selectbox(
         "HIGHLIGHT", 
-        ["이익", "비용", "안정성"], 
+        [*HIGHLIGHT_WEIGHTS, *weight_presets, CUSTOM_HIGHLIGHT], 
         key='selected_highlight'
     )    
+
+    # 사용자 지정 가중치 (슬라이더 조정 시 예측 없이 재정렬만)
+    if highlight_clean == CUSTOM_HIGHLIGHT:
+        custom_weights = (
+            st.slider("CVR", 0.0, 1.0, 0.4, 0.05, key='weight_cvr'),
+            st.slider("1000_W_EFFICIENCY", 0.0, 1.0, 0.3, 0.05, key='weight_eff'),
+            st.slider("ATS", 0.0, 1.0, 0.3, 0.05, key='weight_ats'),
+        )
+        st.session_state['selected_weights'] = normalize_weights(custom_weights)
+
+        preset_name = st.text_input("프리셋 이름", key='preset_name').strip()
+        if st.button("프리셋 저장", disabled=not preset_name):
+            if preset_name in HIGHLIGHT_WEIGHTS or preset_name == CUSTOM_HIGHLIGHT:
+                st.warning("기본 항목과 같은 이름은 사용할 수 없습니다.")
+            else:
+                weight_presets[preset_name] = st.session_state['selected_weights']
+                st.rerun()
+    else:
+        st.session_state['selected_weights'] = (
+            HIGHLIGHT_WEIGHTS.get(highlight_clean) or weight_presets[highlight_clean]
+        )
+
+    # 사전 로드 진행 상황 (완료되면 표시하지 않음)
+    warmup = warmup_status()
+    if warmup is not None and not warmup['complete']:
+        st.caption(f"⏳ 캐시 준비 중 {warmup['done']}/{warmup['total'] or '?'}")
     
 
 # =============================================================================
 # 실행
 # =============================================================================
-pg.run()
\ No newline at end of file
+pg.run()
+
+
+# =============================================================================
+# 성능 디버그 패널 (?debug=1 또는 IVE_DEBUG=1)
+# =============================================================================
+if st.query_params.get("debug") == "1" or os.environ.get("IVE_DEBUG", "0") == "1":
+    with st.sidebar.expander("🛠 성능 디버그", expanded=False):
+        snapshot = metrics.snapshot()
+
+        st.caption("단계별 소요 시간 (최근 관측 기준)")
+        if snapshot['stages']:
+            st.dataframe(
+                pd.DataFrame.from_dict(snapshot['stages'], orient='index'),
+                width='stretch'
+            )
+
+        # 메모리 예산 내역 (종류별 바이트)
+        cache_stats = snapshot['sources'].get('cluster_cache')
+        if cache_stats:
+            st.caption(
+                f"메모리 예산: {cache_stats['bytes'] / 1024 ** 2:,.1f}"
+                f" / {cache_stats['max_bytes'] / 1024 ** 2:,.0f} MB"
+            )
+            if cache_stats['by_kind']:
+                breakdown = pd.DataFrame.from_dict(cache_stats['by_kind'], orient='index')
+                breakdown['MB'] = (breakdown['bytes'] / 1024 ** 2).round(2)
+                st.dataframe(breakdown[['entries', 'MB']], width='stretch')
+
+        st.caption("카운터 / 캐시")
+        st.json({**snapshot['counters'], **snapshot['sources']}, expanded=False)
+
+        st.download_button(
+            "JSON 내보내기", metrics.to_json(),
+            file_name="ive_metrics.json", mime="application/json"
+        )
+        st.download_button(
+            "Prometheus 내보내기", metrics.to_prometheus(),
+            file_name="ive_metrics.prom", mime="text/plain"
+        )
@@ -3,12 +3,12 @@
 # =============================================================================
 
 import streamlit as st
-import pandas as pd
-import pickle
-from sklearn.preprocessing import MinMaxScaler
 import altair as alt
-from io import BytesIO
-import boto3
+
+from utils.data_loader import load_mapping_index, load_ranking, load_weighted_ranking
+from utils.metrics import metrics
+from utils.recommend import HIGHLIGHT_WEIGHTS, TOP_K, budget_split, split_top
+from utils.recommendation_store import lookup_recommendations
 
 # =============================================================================
 # CSS 설정
@@ -108,32 +108,9 @@ st.markdown("<div style='height:20px'></div>", unsafe_allow_html=True)
 # 매핑 데이터 로드
 # =============================================================================
 
-BUCKET_NAME = "ivekorea-airflow-practice-taeeunk"
-FILE_KEY = "ive_ml/Clustering/IVE_CLUSTER_MAPPING_MANUAL.parquet"
-
-# 매핑 데이터 (INDUSTRY/OS_TYPE/LIMIT_TYPE -> CLUSTER)
-@st.cache_data(max_entries=1)
-def load_mapping_data():
-    try:
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=st.secrets["AWS_ACCESS_KEY_ID"],
-            aws_secret_access_key=st.secrets["AWS_SECRET_ACCESS_KEY"]
-        )
-        response = s3.get_object(Bucket=BUCKET_NAME, Key=FILE_KEY)
-        
-        # 전체를 읽지 않고 지정한 columns만 로드
-        df = pd.read_parquet(
-            BytesIO(response['Body'].read()), 
-            engine='pyarrow'
-        )
-        return df
-        
-    except Exception as e:
-        st.error(f"데이터 로드 실패: {e}")
-        return None
-    
-mapping_df = load_mapping_data()
+mapping_index = load_mapping_index()
+if mapping_index is None:
+    st.stop()
 
 # =============================================================================
 # session_state 및 기본값 설정
@@ -144,29 +121,24 @@ os_input = st.session_state.get('selected_os', "WEB")
 limited = st.session_state.get('selected_limited', "UNLIMITED")
 
 highlight = st.session_state['selected_highlight']
+weights = st.session_state.get('selected_weights', HIGHLIGHT_WEIGHTS.get(highlight))
 
-mapping_df['INDUSTRY'] = mapping_df['INDUSTRY'].astype(str).str.strip()
-mapping_df['OS_TYPE'] = mapping_df['OS_TYPE'].astype(str).str.strip().str.lower()
-mapping_df['LIMIT_TYPE'] = mapping_df['LIMIT_TYPE'].astype(str).str.strip()
-
-industry_clean = industry.strip()
-os_input_clean = os_input.strip().lower()
-limited_clean = limited.strip()
+# 과거에 나온 조합만 / 범주 값의 전체 조합까지 점수 계산
+full_grid = st.toggle(
+    "전체 조합 탐색",
+    key='full_grid',
+    help="수행 방식 x 매체 x 시작 시간대의 모든 조합을 예측합니다 (과거에 없던 조합 포함)"
+)
 
 # =============================================================================
 # 데이터 필터링
 # =============================================================================
 
-# 사용자 선택사항 필터링
-result_row = mapping_df[
-        (mapping_df['INDUSTRY'] == industry_clean) &
-        (mapping_df['OS_TYPE'] == os_input_clean) &
-        (mapping_df['LIMIT_TYPE'] == limited_clean)
-    ]
+# 사용자 선택사항으로 클러스터 조회
+cluster_num = mapping_index.lookup(industry, os_input, limited)
 
 # 클러스터 추출
-if not result_row.empty:
-    cluster_num = int(result_row['GMM_CLUSTER'].values[0]) 
+if cluster_num is not None:
     st.session_state['cluster_num'] = cluster_num
 else:
     # 3등분 컬럼으로 가운데 정렬
@@ -182,114 +154,36 @@ else:
 
 cluster_num = int(cluster_num)
 
-## ============================================================================
-# 데이터 및 모델 로드
-## ============================================================================
-
-# 데이터 로드
-@st.cache_data(max_entries=1)
-def load_df(cluster_n):
-    target_columns = [
-        'INDUSTRY', 'OS_TYPE', 'LIMIT_TYPE',
-        '1000_W_EFFICIENCY', 'CVR', 'ATS', 
-        'SHAPE', 'MDA', 'START_TIME', 'TIME_TURN',
-        'GMM_CLUSTER'
-    ]
-    file_key = f"ive_ml/Clustering/IVE_ANALYTICS_CLUSTER_{cluster_n}.parquet"
-
-    try:
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=st.secrets["AWS_ACCESS_KEY_ID"],
-            aws_secret_access_key=st.secrets["AWS_SECRET_ACCESS_KEY"]
-        )
-        response = s3.get_object(Bucket=BUCKET_NAME, Key=file_key)
-        df = pd.read_parquet(
-            BytesIO(response['Body'].read()), 
-            columns=target_columns,
-            engine='pyarrow'
-        )
-        return df
-        
-    except Exception as e:
-        st.error(f"데이터 로드 실패: {e}")
-        return None  
-
-# 모델 로드
-@st.cache_resource(max_entries=1)
-def load_model(cluster_n):
-    file_key = f"ive_ml/Models/Cluster_{cluster_n}_cat_re_models.pkl"
-
-    try:
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=st.secrets["AWS_ACCESS_KEY_ID"],
-            aws_secret_access_key=st.secrets["AWS_SECRET_ACCESS_KEY"],
-            region_name=st.secrets.get("AWS_DEFAULT_REGION", "ap-southeast-2")
-        )
-
-        response = s3.get_object(Bucket=BUCKET_NAME, Key=file_key)
-        model_content = response['Body'].read()
-
-        model = pickle.loads(model_content)
-        return model
-
-    except Exception as e:
-        st.error(f"S3에서 클러스터 {cluster_n} 모델을 불러오는 중 오류 발생: {e}")
-        return None
-    
-df = load_df(cluster_num)
-model = load_model(cluster_num)
-
 # =============================================================================
 # 예측 함수 및 TOP 리스트
 # =============================================================================
-# # x : SHAPE, MDA, START_TIME -> CVR, 1000_W_EFFICIENCY, ATS 예측
-@st.cache_resource
-def prediction_TOP_3(df, _model, highlight):
-    unique_conditions = df[['SHAPE', 'MDA', 'START_TIME']].drop_duplicates()
-    result_df = unique_conditions.copy()
-    result_df['MDA'] = result_df['MDA'].astype(str)
-    
-    targets = {
-            'CVR': 'Pred_CVR',
-            '1000_W_EFFICIENCY': 'Pred_EFF',
-            'ATS': 'Pred_ATS'
-        }
-
-    for model_key_name, col_name in targets.items():
-        target_model = _model[model_key_name]
-            
-        if hasattr(target_model, 'predict'):
-            result_df[col_name] = target_model.predict(unique_conditions)
-        else:
-            result_df[col_name] = float(target_model)
-
-    scaler = MinMaxScaler(feature_range=(0, 100))
-    scaled_vals = scaler.fit_transform(result_df[['Pred_CVR', 'Pred_EFF', 'Pred_ATS']])
-    result_df['CVR_scaled'] = scaled_vals[:, 0]
-    result_df['EFF_scaled'] = scaled_vals[:, 1]
-    result_df['ATS_scaled'] = scaled_vals[:, 2]
-
-    # 중점 사항에 따른 가중치 수정
-    if highlight == "이익":
-        result_df['score'] = result_df['CVR_scaled']*0.5 + result_df['EFF_scaled']*0.25 + result_df['ATS_scaled']*0.25
-    elif highlight == "비용":
-        result_df['score'] = result_df['CVR_scaled']*0.25 + result_df['EFF_scaled']*0.5 + result_df['ATS_scaled']*0.25
-    elif highlight == "안정성":
-        result_df['score'] = result_df['CVR_scaled']*0.25 + result_df['EFF_scaled']*0.25 + result_df['ATS_scaled']*0.5
-
-    top_10 = result_df.sort_values('score', ascending=False).head(10).copy()
-    top = result_df.sort_values('score', ascending=False).head(3).copy()
-
-    top['rank_label'] = [1,2,3]
-    top1 = top[top['rank_label']==1].reset_index(drop=True)
-    top2 = top[top['rank_label']==2].reset_index(drop=True)
-    top3 = top[top['rank_label']==3].reset_index(drop=True)
-    
-    return top1, top2, top3, top, top_10
+# 결과는 (클러스터, 데이터 버전, 모델 버전, HIGHLIGHT) 로 캐시 - 히트면 데이터 / 모델을 로드하지 않음
+# 예측은 클러스터 / 모델 버전당 한 번, HIGHLIGHT 변경 시에는 재정렬만
+@metrics.timed("prediction_TOP_3")
+def prediction_TOP_3(cluster_n, highlight, mode):
+    return load_ranking(cluster_n, highlight, k=TOP_K, mode=mode)
+
+
+# 사용자 지정 / 프리셋 가중치 - 캐시된 예측 행렬에서 재정렬만
+@metrics.timed("rerank_TOP_3")
+def rerank_TOP_3(cluster_n, weights, mode):
+    return load_weighted_ranking(cluster_n, weights, k=TOP_K, mode=mode)
+
+mode = "grid" if full_grid else "history"
+
+if highlight in HIGHLIGHT_WEIGHTS:
+    # 사전 계산된 결과 우선 (과거 조합 기준), 없거나 오래되었으면 실시간 추론
+    ranked = None if full_grid else lookup_recommendations(cluster_num, highlight)
+    if ranked is None:
+        ranked = prediction_TOP_3(cluster_num, highlight, mode)
+else:
+    st.caption("가중치 · CVR {:.2f} / 1000_W_EFFICIENCY {:.2f} / ATS {:.2f}".format(*weights))
+    ranked = rerank_TOP_3(cluster_num, weights, mode)
+
+if ranked is None:
+    st.stop()
 
-top1, top2, top3, top, top_10 = prediction_TOP_3(df, model, highlight)
+top1, top2, top3, top, top_10 = split_top(ranked)
 
  
 # =============================================================================
@@ -377,9 +271,10 @@ rank_order = ['TOP 1', 'TOP 2', 'TOP 3']
 color_range = ['#FF6C6C', '#4CA8FF', '#56D97D']
 
 # 수식 계산(예산 분배 방법) - 100% SPLIT
-total_score = top_chart['score'].sum()
-top_chart['rate_val'] = (top_chart['score'] / total_score) * 100 
-top_chart['rate_val'] = top_chart['rate_val'].round(1)
+# 점수 합이 0 이면 (예: 상수 타깃에만 가중치) budget_split 이 균등 분할
+top_chart['rate_val'] = budget_split(top_chart['score'])
+if not top_chart['score'].sum() > 0:
+    st.caption("상위 후보의 점수가 모두 0 이라 예산을 균등하게 배분합니다. 가중치를 조정해 보세요.")
 top_chart['rate_str'] = top_chart['rate_val'].astype(str) + "%"
 top_chart['rank_label'] = [f'TOP {i+1}' for i in range(len(top_chart))]
 
@@ -416,7 +311,8 @@ chart = (pie + text).properties(
     height=350
 )
 
-st.altair_chart(chart, use_container_width=True)
+with metrics.timer("render_altair"):
+    st.altair_chart(chart, use_container_width=True)
 
 st.divider()
 
@@ -429,7 +325,8 @@ tab1, tab2 = st.tabs(["광고 형태 추천","추가 설명"])
 # TOP_15 표
 with tab1:
     stats_df = top_10
-    st.dataframe(stats_df, width='stretch', height='stretch')
+    with metrics.timer("render_dataframe"):
+        st.dataframe(stats_df, width='stretch', height='stretch')
 
 # 추가 설명
 with tab2:
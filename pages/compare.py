@@ -0,0 +1,146 @@
+# =============================================================================
+# 시나리오 비교 페이지
+# =============================================================================
+
+import streamlit as st
+import pandas as pd
+
+from utils.data_loader import get_rankings, load_mapping_index
+from utils.mapping_index import INDUSTRY_OPTIONS, LIMIT_OPTIONS, OS_OPTIONS
+from utils.metrics import metrics
+from utils.recommend import HIGHLIGHT_WEIGHTS, TOP_K
+
+## ============================================================================
+# 페이지 제목 설정
+## ============================================================================
+
+st.markdown(
+    """
+    <h2 style="margin-top: -30px;">🆚 시나리오 비교</h2>
+    """,
+    unsafe_allow_html=True
+)
+st.markdown("<div style='height:20px'></div>", unsafe_allow_html=True)
+
+# =============================================================================
+# 매핑 데이터 로드
+# =============================================================================
+
+mapping_index = load_mapping_index()
+if mapping_index is None:
+    st.stop()
+
+# =============================================================================
+# session_state 및 기본값 설정
+# =============================================================================
+
+highlight = st.session_state.get('selected_highlight', "이익")
+weights = st.session_state.get('selected_weights', HIGHLIGHT_WEIGHTS.get(highlight))
+
+# 첫 진입 시 사이드바에서 고른 조합 하나로 시작
+if 'compare_scenarios' not in st.session_state:
+    st.session_state['compare_scenarios'] = pd.DataFrame([{
+        'INDUSTRY': st.session_state.get('selected_industry', "금융/보험"),
+        'OS_TYPE': st.session_state.get('selected_os', "WEB"),
+        'LIMIT_TYPE': st.session_state.get('selected_limited', "UNLIMITED"),
+    }])
+
+# =============================================================================
+# 시나리오 입력
+# =============================================================================
+
+st.subheader("비교할 조합")
+st.caption(f"HIGHLIGHT : {highlight} (사이드바에서 변경)")
+
+scenarios = st.data_editor(
+    st.session_state['compare_scenarios'],
+    num_rows="dynamic",
+    width='stretch',
+    column_config={
+        'INDUSTRY': st.column_config.SelectboxColumn("산업군", options=INDUSTRY_OPTIONS, required=True),
+        'OS_TYPE': st.column_config.SelectboxColumn("OS 환경", options=OS_OPTIONS, required=True),
+        'LIMIT_TYPE': st.column_config.SelectboxColumn("목표 제한 여부", options=LIMIT_OPTIONS, required=True),
+    },
+    key='compare_editor'
+).dropna()
+
+col1, col2 = st.columns(2)
+with col1:
+    k = st.slider("표시 개수", 1, TOP_K, 3, key='compare_k')
+with col2:
+    full_grid = st.toggle(
+        "전체 조합 탐색",
+        key='compare_full_grid',
+        help="수행 방식 x 매체 x 시작 시간대의 모든 조합을 예측합니다 (과거에 없던 조합 포함)"
+    )
+
+# =============================================================================
+# 클러스터별 묶기
+# =============================================================================
+# 같은 GMM_CLUSTER 의 시나리오는 결과가 같으므로 클러스터당 한 번만 로드 / 예측
+
+scenarios = scenarios.drop_duplicates().reset_index(drop=True)
+scenarios['GMM_CLUSTER'] = [
+    mapping_index.lookup(*row)
+    for row in scenarios[['INDUSTRY', 'OS_TYPE', 'LIMIT_TYPE']].itertuples(index=False)
+]
+
+missing = scenarios[scenarios['GMM_CLUSTER'].isna()]
+if not missing.empty:
+    st.warning(
+        "데이터가 부족한 조합은 제외했습니다: "
+        + ", ".join(" / ".join(row) for row in missing[['INDUSTRY', 'OS_TYPE', 'LIMIT_TYPE']].itertuples(index=False))
+    )
+
+scenarios = scenarios.dropna(subset=['GMM_CLUSTER'])
+if scenarios.empty:
+    st.stop()
+
+scenarios['GMM_CLUSTER'] = scenarios['GMM_CLUSTER'].astype(int)
+groups = scenarios.groupby('GMM_CLUSTER', sort=True)
+
+# =============================================================================
+# 클러스터별 추천 (병렬)
+# =============================================================================
+# TOP_K 로 계산해서 결과 캐시를 TOP_3 페이지와 공유, 표시는 k 개만
+
+@metrics.timed("compare_rankings")
+def compare_rankings(clusters, highlight, weights, mode):
+    return get_rankings(clusters, highlight, weights, k=TOP_K, mode=mode)
+
+rankings = compare_rankings(list(groups.groups), highlight, weights, "grid" if full_grid else "history")
+
+# =============================================================================
+# 나란히 비교
+# =============================================================================
+
+st.divider()
+st.subheader(f"TOP {k} 비교")
+
+table = {}
+for cluster_n, group in groups:
+    ranked = rankings[cluster_n]
+    if isinstance(ranked, Exception):
+        st.error(f"클러스터 {cluster_n} 추천 계산 실패: {ranked}")
+        continue
+
+    label = f"클러스터 {cluster_n} ({len(group)}개 조합)"
+    top = ranked.head(k)
+    table[label] = [
+        f"{row.SHAPE} · {row.MDA} · {row.START_TIME} ({row.score:.2f})"
+        for row in top[['SHAPE', 'MDA', 'START_TIME', 'score']].itertuples(index=False)
+    ] + [""] * (k - len(top))
+
+if table:
+    with metrics.timer("render_dataframe"):
+        st.dataframe(
+            pd.DataFrame(table, index=[f"TOP {i + 1}" for i in range(k)]),
+            width='stretch'
+        )
+
+# 클러스터별 조합 목록
+with st.expander("클러스터별 조합"):
+    st.dataframe(
+        scenarios.sort_values('GMM_CLUSTER').reset_index(drop=True),
+        width='stretch', hide_index=True
+    )
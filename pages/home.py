@@ -3,11 +3,11 @@
 # =============================================================================
 
 import streamlit as st
-import pandas as pd
-import numpy as np
 import altair as alt
-import boto3
-from io import BytesIO
+
+from utils.data_loader import load_mapping_index, load_df
+from utils.metrics import metrics
+from utils.summary import load_summary, summary_frame
 
 # =============================================================================
 # CSS 설정
@@ -111,30 +111,9 @@ st.markdown("<div style='height:20px'></div>", unsafe_allow_html=True)
 # 데이터 로드
 # =============================================================================
 
-BUCKET_NAME = "ivekorea-airflow-practice-taeeunk"
-FILE_KEY = "ive_ml/Clustering/IVE_CLUSTER_MAPPING_MANUAL.parquet"
-
-# 매핑 데이터 (INDUSTRY/OS_TYPE/LIMIT_TYPE -> CLUSTER)
-@st.cache_data(max_entries=1)
-def load_mapping_data():
-    try:
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=st.secrets["AWS_ACCESS_KEY_ID"],
-            aws_secret_access_key=st.secrets["AWS_SECRET_ACCESS_KEY"]
-        )
-        response = s3.get_object(Bucket=BUCKET_NAME, Key=FILE_KEY)
-        df = pd.read_parquet(
-            BytesIO(response['Body'].read()), 
-            engine='pyarrow'
-        )
-        return df
-        
-    except Exception as e:
-        st.error(f"데이터 로드 실패: {e}")
-        return None
-
-mapping_df = load_mapping_data()
+mapping_index = load_mapping_index()
+if mapping_index is None:
+    st.stop()
 
 # =============================================================================
 # session_state 및 기본값 설정
@@ -145,24 +124,11 @@ os_input = st.session_state.get('selected_os', "WEB")
 limited = st.session_state.get('selected_limited', "UNLIMITED")
 highlight = st.session_state.get('selected_highlight', "이익")
 
-mapping_df['INDUSTRY'] = mapping_df['INDUSTRY'].astype(str).str.strip()
-mapping_df['OS_TYPE'] = mapping_df['OS_TYPE'].astype(str).str.strip().str.lower()
-mapping_df['LIMIT_TYPE'] = mapping_df['LIMIT_TYPE'].astype(str).str.strip()
-
-industry_clean = industry.strip()
-os_input_clean = os_input.strip().lower()
-limited_clean = limited.strip()
-
-# 사용자 선택사항 필터링
-result_row = mapping_df[
-        (mapping_df['INDUSTRY'] == industry_clean) &
-        (mapping_df['OS_TYPE'] == os_input_clean) &
-        (mapping_df['LIMIT_TYPE'] == limited_clean)
-    ]
+# 사용자 선택사항으로 클러스터 조회
+cluster_num = mapping_index.lookup(industry, os_input, limited)
 
 # 클러스터 추출
-if not result_row.empty:
-    cluster_num = int(result_row['GMM_CLUSTER'].values[0]) 
+if cluster_num is not None:
     st.session_state['cluster_num'] = cluster_num
 else:
     # 3등분 컬럼으로 가운데 정렬
@@ -178,56 +144,29 @@ else:
 cluster_num = int(cluster_num)
 
 ## ============================================================================
-# 데이터 로드
+# 요약 통계 로드 (원본 데이터 없이 사이드카 사용)
 ## ============================================================================
 
-@st.cache_data(max_entries=1)
-def load_df(cluster_n):
-    target_columns = [
-        'INDUSTRY', 'OS_TYPE', 'LIMIT_TYPE',
-        '1000_W_EFFICIENCY', 'CVR', 'ATS', 
-        'SHAPE', 'MDA', 'START_TIME', 'TIME_TURN',
-        'GMM_CLUSTER'
-    ]
-    file_key = f"ive_ml/Clustering/IVE_ANALYTICS_CLUSTER_{cluster_n}.parquet"
-
-    try:
-        s3 = boto3.client(
-            's3',
-            aws_access_key_id=st.secrets["AWS_ACCESS_KEY_ID"],
-            aws_secret_access_key=st.secrets["AWS_SECRET_ACCESS_KEY"]
-        )
-        response = s3.get_object(Bucket=BUCKET_NAME, Key=file_key)
-        df = pd.read_parquet(
-            BytesIO(response['Body'].read()), 
-            columns=target_columns,
-            engine='pyarrow'
-        )
-        return df
-        
-    except Exception as e:
-        st.error(f"데이터 로드 실패: {e}")
-        return None  
-
-filtered_df = load_df(cluster_num)
+summary = load_summary(cluster_num)
+if summary is None:
+    st.stop()
 
 # =============================================================================
 # KPI
 # =============================================================================
 
-# 기초 프레임 구축
-col1, col2, col3 = st.columns(3)
+kpi = summary['kpi']
 
-if not filtered_df.empty:
-    eff_value = filtered_df['1000_W_EFFICIENCY'].mean()
-    cvr_value = filtered_df['CVR'].mean()*100
+if summary['rows'] > 0:
+    eff_value = kpi['eff_mean']
+    cvr_value = kpi['cvr_mean']*100
     display_eff = f"{int(eff_value):,}"
     display_cvr = f"{cvr_value:.2f}%"
-    time_turn_value = filtered_df['TIME_TURN'].mean()
+    display_turn = f"{kpi['time_turn_mean']:.2f}"
 else:
     display_eff = "-"
     display_cvr = "-"
-    time_turn_value = "-"
+    display_turn = "-"
 
 col1, col2, col3 = st.columns(3, gap="small")
 
@@ -236,7 +175,7 @@ with col1:
     st.markdown(f"""
     <div class="kpi-card">
         <div class="kpi-title">TURN</div>
-        <div class="kpi-value">{time_turn_value:.2f}</div>
+        <div class="kpi-value">{display_turn}</div>
         <div class="kpi-sub">전환 수 평균</div>
     </div>
     """, unsafe_allow_html=True)
@@ -269,31 +208,14 @@ with st.container():
     st.markdown('<div class="full-width-card">', unsafe_allow_html=True)
     st.markdown('<div class="chart-title">📊 클러스터 분석 차트</div>', unsafe_allow_html=True)
 
-    if 'cluster_num' in st.session_state and mapping_df is not None:
+    if 'cluster_num' in st.session_state and mapping_index is not None:
         c_num = st.session_state['cluster_num']
         
-        target_df = mapping_df[mapping_df['GMM_CLUSTER'] == c_num].copy()
-
-        if not target_df.empty:
-            # (1) 산업군
-            df_ind = target_df['INDUSTRY'].value_counts().reset_index()
-            df_ind.columns = ['Label', 'Count']
-            df_ind['Category'] = '산업군'
-
-            # (2) OS
-            df_os = target_df['OS_TYPE'].value_counts().reset_index()
-            df_os.columns = ['Label', 'Count']
-            df_os['Category'] = 'OS'
-
-            # (3) 목표 제한 여부
-            df_qt = target_df['LIMIT_TYPE'].value_counts().reset_index()
-            df_qt.columns = ['Label', 'Count']
-            df_qt['Category'] = '목표 제한 여부'
-
-            # (4) 데이터 합치기
-            final_chart_df = pd.concat([df_ind, df_os, df_qt])
+        # 로드 시점에 계산해 둔 산업군 / OS / 목표 제한 여부 빈도
+        final_chart_df = mapping_index.cluster_chart_counts(c_num)
 
-            # (5) 차트 생성
+        if not final_chart_df.empty:
+            # 차트 생성
             chart = alt.Chart(final_chart_df).mark_bar(
                 cornerRadiusTopLeft=5, 
                 cornerRadiusTopRight=5
@@ -313,7 +235,8 @@ with st.container():
                 strokeWidth=0
             )
             
-            st.altair_chart(chart, use_container_width=True)
+            with metrics.timer("render_altair"):
+                st.altair_chart(chart, use_container_width=True)
         
         else:
             st.info("차트를 표시할 데이터가 없습니다.")
@@ -335,18 +258,24 @@ st.text("") # 여백
 # =============================================================================
 st.subheader("기술 통계")
 
-tab1, tab2 = st.tabs(["요약 통계", "상관관계"])
+tab1, tab2, tab3 = st.tabs(["요약 통계", "상관관계", "원본 데이터"])
 
 with tab1:
     st.write("**필터링된 데이터의 기술 통계량**")
-    stats_df = filtered_df.describe()
+    stats_df = summary_frame(summary, 'describe')
     st.dataframe(stats_df, width='stretch')
 
 with tab2:
     st.write("**변수 간 상관관계**")
-    numeric_cols = filtered_df.select_dtypes(include=[np.number]).columns
-    corr_matrix = filtered_df[numeric_cols].corr()
+    corr_matrix = summary_frame(summary, 'corr')
     st.dataframe(
         corr_matrix.style.background_gradient(cmap='RdYlBu', vmin=-1, vmax=1),
         width='stretch'
-    )
\ No newline at end of file
+    )
+
+# 원본 행은 사용자가 요청할 때만 로드
+with tab3:
+    if st.toggle("원본 데이터 불러오기", key='show_raw_data'):
+        filtered_df = load_df(cluster_num)
+        if filtered_df is not None:
+            st.dataframe(filtered_df, width='stretch')
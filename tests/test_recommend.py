@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from utils.recommend import budget_split
+
+
+def test_budget_split_proportional():
+    rates = budget_split(pd.Series([50.0, 30.0, 20.0], index=[4, 7, 9]))
+    assert rates.tolist() == [50.0, 30.0, 20.0]
+    assert rates.index.tolist() == [4, 7, 9]
+
+
+def test_budget_split_zero_scores_split_equally():
+    # 모든 점수가 0 이면 NaN 대신 균등 분할
+    rates = budget_split(np.array([0.0, 0.0, 0.0]))
+    assert rates.tolist() == [33.3, 33.3, 33.3]
+
+    rates = budget_split(pd.Series([0.0, 0.0], index=[2, 5]))
+    assert rates.tolist() == [50.0, 50.0]
+    assert rates.index.tolist() == [2, 5]
+
+
+def test_budget_split_non_finite_sum_split_equally():
+    rates = budget_split(np.array([np.nan, 1.0, 1.0]))
+    assert np.isfinite(rates).all()
+    assert rates.tolist() == [33.3, 33.3, 33.3]
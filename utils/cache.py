@@ -0,0 +1,210 @@
+# =============================================================================
+# 메모리(바이트) 기준 LRU 캐시 (프로세스 전체 메모리 예산)
+# =============================================================================
+# 매핑 인덱스, 클러스터 데이터 / 모델, 예측 결과, 요약 통계를 모두 한 예산
+# (IVE_CACHE_MAX_MB) 안에서 관리한다.
+# - 항목마다 우선순위를 두고, 예산을 넘으면 낮은 우선순위의 오래된 항목부터 제거
+#   (원본 행 < 파생 결과 < 모델 < 인덱스)
+# - 새 항목은 자기보다 높은 우선순위 항목을 밀어내지 않는다
+# - stats() 에 종류(키의 첫 요소)별 / 우선순위별 바이트 내역 포함
+
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoost
+
+from utils.metrics import metrics
+
+DEFAULT_MAX_MB = 1024
+
+# 제거 우선순위 (낮을수록 먼저 제거)
+PRIORITY_ROWS = 0       # 원본 클러스터 행 - 크고 언제든 다시 읽을 수 있음
+PRIORITY_DERIVED = 1    # 예측 결과, 요약 통계
+PRIORITY_MODEL = 2      # 모델 - 역직렬화 비용이 큼
+PRIORITY_INDEX = 3      # 매핑 인덱스, 사전 계산 추천 - 모든 요청이 사용
+
+PRIORITY_NAMES = {
+    PRIORITY_ROWS: "rows",
+    PRIORITY_DERIVED: "derived",
+    PRIORITY_MODEL: "model",
+    PRIORITY_INDEX: "index",
+}
+
+
+def estimate_size(obj):
+    # 캐시 항목의 메모리 사용량(바이트) 추정
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_size(v) for v in obj)
+    if isinstance(obj, (int, float, str, type(None))):
+        return sys.getsizeof(obj)
+
+    # 자체 크기 계산을 제공하는 객체
+    if hasattr(obj, 'memory_bytes'):
+        return int(obj.memory_bytes())
+
+    # CatBoost 모델은 메모리에 올라간 트리와 같은 크기의 cbm 직렬화 결과로 근사
+    if isinstance(obj, CatBoost):
+        return len(obj._serialize_model())
+
+    # 모델 등 기타 객체는 직렬화 크기로 근사
+    try:
+        return len(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(obj)
+
+
+def _kind(key):
+    return key[0] if isinstance(key, tuple) and key else "other"
+
+
+class ByteLRUCache:
+    # max_bytes를 넘으면 우선순위가 낮은 항목 중 가장 오래 사용되지 않은 것부터 제거
+    # 반환된 객체는 모든 세션이 공유하므로 호출하는 쪽에서 수정하지 않는다
+
+    def __init__(self, max_bytes):
+        self.max_bytes = int(max_bytes)
+        self._entries = {}              # key -> (value, nbytes, priority)
+        self._order = {}                # priority -> OrderedDict(key -> None), LRU 순서
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def _touch(self, key):
+        # 잠금 안에서 호출 - 히트 처리 후 값 반환
+        value, _, priority = self._entries[key]
+        self._order[priority].move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                return self._touch(key)
+            self.misses += 1
+            return default
+
+    def put(self, key, value, nbytes=None, priority=PRIORITY_DERIVED):
+        if nbytes is None:
+            nbytes = estimate_size(value)
+
+        with self._lock:
+            self._remove(key)
+
+            # 같거나 낮은 우선순위 항목만 밀어내서 자리가 나지 않으면 캐시하지 않는다
+            if nbytes > self.max_bytes - self._bytes_above(priority):
+                metrics.incr("cache_rejected_total")
+                return value
+
+            while self.current_bytes + nbytes > self.max_bytes:
+                self._evict_one()
+
+            self._entries[key] = (value, nbytes, priority)
+            self._order.setdefault(priority, OrderedDict())[key] = None
+            self.current_bytes += nbytes
+        return value
+
+    def get_or_load(self, key, loader, priority=PRIORITY_DERIVED):
+        with self._lock:
+            if key in self._entries:
+                return self._touch(key)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # 같은 키를 여러 세션이 동시에 요청하면 한 번만 다운로드
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    return self._touch(key)
+                self.misses += 1
+            try:
+                return self.put(key, loader(), priority=priority)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_where(self, predicate):
+        # predicate(key) 가 참인 항목 모두 제거, 제거한 개수 반환
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._order.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            by_kind = {}
+            by_priority = {}
+            for key, (_, nbytes, priority) in self._entries.items():
+                for bucket, name in (
+                    (by_kind, str(_kind(key))),
+                    (by_priority, PRIORITY_NAMES.get(priority, str(priority))),
+                ):
+                    totals = bucket.setdefault(name, {"entries": 0, "bytes": 0})
+                    totals["entries"] += 1
+                    totals["bytes"] += nbytes
+
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "by_kind": by_kind,
+                "by_priority": by_priority,
+            }
+
+    def _bytes_above(self, priority):
+        return sum(nbytes for _, nbytes, p in self._entries.values() if p > priority)
+
+    def _evict_one(self):
+        for priority in sorted(self._order):
+            order = self._order[priority]
+            if order:
+                self._remove(next(iter(order)))
+                self.evictions += 1
+                return
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+            del self._order[entry[2]][key]
+
+
+# 프로세스 전체(모든 페이지 / 세션)에서 공유하는 캐시 = 메모리 예산
+cluster_cache = ByteLRUCache(
+    int(os.environ.get("IVE_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024
+)
+metrics.register_source("cluster_cache", cluster_cache.stats)
@@ -0,0 +1,482 @@
+# =============================================================================
+# 데이터 / 모델 로드 (모든 페이지 공용)
+# =============================================================================
+
+import logging
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+from utils.cache import PRIORITY_DERIVED, PRIORITY_INDEX, PRIORITY_MODEL, PRIORITY_ROWS, cluster_cache
+from utils.ipc_cache import host_cache
+from utils.keys import (
+    MAPPING_KEY, cluster_data_key, cluster_model_key, cluster_model_manifest_key, cluster_model_prefix
+)
+from utils.mapping_index import MappingIndex
+from utils.metrics import metrics
+from utils.model_io import load_model_bundle
+from utils.partitioned_dataset import (
+    cluster_version as dataset_cluster_version, dataset_enabled, read_clusters
+)
+from utils.recommend import (
+    HIGHLIGHT_WEIGHTS, TOP_K, CandidatePredictions, normalize_weights, predict_candidates, predict_grid
+)
+from utils.storage import get_storage, is_missing
+
+logger = logging.getLogger(__name__)
+
+TARGET_COLUMNS = [
+    'INDUSTRY', 'OS_TYPE', 'LIMIT_TYPE',
+    '1000_W_EFFICIENCY', 'CVR', 'ATS',
+    'SHAPE', 'MDA', 'START_TIME', 'TIME_TURN',
+    'GMM_CLUSTER'
+]
+
+# 메모리 절약용 스키마 (사전 인코딩 범주형 / float32)
+CATEGORY_COLUMNS = ['INDUSTRY', 'OS_TYPE', 'LIMIT_TYPE', 'SHAPE', 'MDA', 'START_TIME']
+FLOAT32_COLUMNS = ['1000_W_EFFICIENCY', 'CVR', 'ATS', 'TIME_TURN']
+
+
+def compact_frame(df):
+    # 문자열 컬럼 -> category, 지표 -> float32, 클러스터 번호 -> 최소 정수형
+    df = df.astype({
+        **{col: 'category' for col in CATEGORY_COLUMNS if col in df.columns},
+        **{col: 'float32' for col in FLOAT32_COLUMNS if col in df.columns},
+    })
+    if 'GMM_CLUSTER' in df.columns:
+        df['GMM_CLUSTER'] = pd.to_numeric(df['GMM_CLUSTER'], downcast='integer')
+    return df
+
+
+# 매핑 데이터 (INDUSTRY/OS_TYPE/LIMIT_TYPE -> CLUSTER)
+def fetch_mapping_data():
+    table, _ = get_storage().read_table(MAPPING_KEY)
+    with metrics.timer("mapping_decode"):
+        return table.to_pandas()
+
+
+def get_mapping_index():
+    # 실패 시 예외가 그대로 올라가므로 None이 캐시되지 않는다
+    return cluster_cache.get_or_load(
+        ("mapping",), lambda: MappingIndex(fetch_mapping_data()), priority=PRIORITY_INDEX
+    )
+
+
+def load_mapping_index():
+    try:
+        return get_mapping_index()
+
+    except Exception as e:
+        st.error(f"데이터 로드 실패: {e}")
+        return None
+
+
+# =============================================================================
+# 클러스터 데이터 / 모델 (바이트 기준 LRU 캐시 공유)
+# =============================================================================
+
+def _read_df(cluster_n):
+    # 반환값: (DataFrame, 버전)
+    key = cluster_data_key(cluster_n)
+
+    # 단일 데이터셋: GMM_CLUSTER 필터로 해당 클러스터만 스캔
+    if dataset_enabled():
+        with metrics.timer("dataset_scan", cluster=cluster_n):
+            table = read_clusters([cluster_n], columns=TARGET_COLUMNS)
+        version = dataset_cluster_version(cluster_n)
+        get_storage().remember(key, version)
+    else:
+        table, version = get_storage().read_table(key, columns=TARGET_COLUMNS)
+
+    with metrics.timer("parquet_decode", cluster=cluster_n):
+        return compact_frame(table.to_pandas()), version
+
+
+def fetch_df_versioned(cluster_n):
+    # 반환값: (DataFrame, 버전)
+    if not host_cache.enabled:
+        return _read_df(cluster_n)
+
+    # 호스트 공용 IPC 캐시: 현재 버전 파일이 있으면 다운로드 / 디코딩 없이 매핑
+    key = cluster_data_key(cluster_n)
+    version = data_version(cluster_n)
+    df = host_cache.load(key, version)
+    if df is not None:
+        get_storage().remember(key, version)
+        return df, version
+
+    # 실제로 읽은 버전으로 저장 (HEAD 와 GET 사이에 원본이 바뀌어도 섞이지 않음)
+    df, version = _read_df(cluster_n)
+    return host_cache.store(key, version, df), version
+
+
+def fetch_df(cluster_n):
+    return fetch_df_versioned(cluster_n)[0]
+
+
+def fetch_cluster_frames(clusters):
+    # 여러 클러스터를 한 번에 로드 -> {클러스터: DataFrame}
+    if not dataset_enabled():
+        return {cluster_n: fetch_df(cluster_n) for cluster_n in clusters}
+
+    frame = compact_frame(read_clusters(clusters, columns=TARGET_COLUMNS).to_pandas())
+    frames = {int(cluster_n): group for cluster_n, group in frame.groupby('GMM_CLUSTER', observed=True)}
+    for cluster_n in clusters:
+        get_storage().remember(cluster_data_key(cluster_n), dataset_cluster_version(cluster_n))
+    return {cluster_n: frames.get(int(cluster_n), frame.iloc[0:0]) for cluster_n in clusters}
+
+
+def data_version(cluster_n):
+    # 클러스터 데이터의 현재 버전 (본문 없이 확인)
+    if dataset_enabled():
+        return dataset_cluster_version(cluster_n)
+    return get_storage().version(cluster_data_key(cluster_n))
+
+
+# 원본이 바뀌었는지 확인하는 HEAD 요청은 주기(초)당 한 번
+VERSION_CHECK_TTL = 300
+
+
+@st.cache_data(ttl=VERSION_CHECK_TTL, show_spinner=False)
+def current_data_version(cluster_n):
+    return data_version(cluster_n)
+
+
+def _current_version(storage, key):
+    # 현재 버전, 객체가 없으면 None
+    try:
+        return storage.version(key)
+    except Exception as e:
+        if not is_missing(e):
+            raise
+        return None
+
+
+def _bundle_version(manifest_version, pickle_version):
+    # 모델 버전 = manifest + 원본 pickle (pickle 만 다시 올라와도 버전이 바뀐다)
+    if manifest_version is None:
+        return pickle_version
+    return f"{manifest_version}+{pickle_version}"
+
+
+def _load_pickle(storage, cluster_n):
+    path = storage.path(cluster_model_key(cluster_n))
+    with metrics.timer("pickle_load", cluster=cluster_n), open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def fetch_model_versioned(cluster_n):
+    # 반환값: (모델, 버전) - 네이티브 모델이 있으면 pickle 없이 cbm 파일에서 로드
+    # 번들의 source_etag 가 현재 pickle 버전과 다르면(변환 이후 pickle 재배포) pickle 로 로드
+    storage = get_storage()
+    manifest_key = cluster_model_manifest_key(cluster_n)
+    pickle_version = _current_version(storage, cluster_model_key(cluster_n))
+    try:
+        manifest_path = storage.path(manifest_key)
+    except Exception as e:
+        if not is_missing(e):
+            raise
+        return _load_pickle(storage, cluster_n), pickle_version
+
+    version = _bundle_version(storage.cached_version(manifest_key), pickle_version)
+    prefix = cluster_model_prefix(cluster_n)
+    model = load_model_bundle(
+        manifest_path,
+        lambda file_name: storage.path(f"{prefix}/{file_name}")
+    )
+    if pickle_version is not None and model.source_etag != pickle_version:
+        logger.warning(
+            "클러스터 %s: cbm 번들이 현재 pickle 과 다름 (%s != %s) - pickle 로 로드",
+            cluster_n, model.source_etag, pickle_version
+        )
+        metrics.incr("model_bundle_stale_total")
+        return _load_pickle(storage, cluster_n), version
+    return model, version
+
+
+def fetch_model(cluster_n):
+    return fetch_model_versioned(cluster_n)[0]
+
+
+def model_version(cluster_n):
+    # 모델의 현재 버전 (fetch_model_versioned 와 같은 규칙 - manifest 와 pickle 둘 다 감시)
+    storage = get_storage()
+    return _bundle_version(
+        _current_version(storage, cluster_model_manifest_key(cluster_n)),
+        _current_version(storage, cluster_model_key(cluster_n))
+    )
+
+
+# 공유 캐시에 올라간 데이터 / 모델 객체의 버전 ("df" | "model", 클러스터) -> 버전
+# 저장소가 기억하는 최신 버전이 아니라 실제로 사용 중인 객체 기준 (핫 리로드 교체 시 함께 전환)
+_loaded_versions = {}
+_versions_lock = threading.Lock()
+
+
+def _loaded(kind, cluster_n, value, version):
+    with _versions_lock:
+        _loaded_versions[(kind, cluster_n)] = version
+    return value
+
+
+def loaded_versions():
+    with _versions_lock:
+        return dict(_loaded_versions)
+
+
+def cluster_version(cluster_n):
+    # 사용 중인 (데이터 버전, 모델 버전), 아직 로드하지 않았으면 None
+    with _versions_lock:
+        return (
+            _loaded_versions.get(("df", cluster_n)),
+            _loaded_versions.get(("model", cluster_n)),
+        )
+
+
+# 데이터 / 모델 동시 로드용 스레드 풀
+_bundle_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("IVE_LOADER_WORKERS", "8")),
+    thread_name_prefix="ive-loader"
+)
+
+
+# 캐시 경유 로드 (실패 시 예외 - 백그라운드 작업용)
+def get_df(cluster_n):
+    return cluster_cache.get_or_load(
+        ("df", cluster_n),
+        lambda: _loaded("df", cluster_n, *fetch_df_versioned(cluster_n)),
+        priority=PRIORITY_ROWS
+    )
+
+
+def get_model(cluster_n):
+    return cluster_cache.get_or_load(
+        ("model", cluster_n),
+        lambda: _loaded("model", cluster_n, *fetch_model_versioned(cluster_n)),
+        priority=PRIORITY_MODEL
+    )
+
+
+def _timed(loader, cluster_n):
+    start = time.perf_counter()
+    value = loader(cluster_n)
+    return value, time.perf_counter() - start
+
+
+def _get_model_loaded(cluster_n):
+    model = get_model(cluster_n)
+    # 네이티브 번들은 지연 로드이므로 여기서 함께 역직렬화
+    if hasattr(model, 'load_all'):
+        model.load_all()
+    return model
+
+
+def get_cluster_bundle(cluster_n):
+    # 데이터 parquet 과 모델을 동시에 받아 병렬로 디코딩
+    # 반환값: (df, model, {"df": 초, "model": 초})
+    df_future = _bundle_pool.submit(_timed, get_df, cluster_n)
+    model_future = _bundle_pool.submit(_timed, _get_model_loaded, cluster_n)
+
+    df, df_sec = df_future.result()
+    model, model_sec = model_future.result()
+    metrics.observe("bundle_df", df_sec, cluster=cluster_n)
+    metrics.observe("bundle_model", model_sec, cluster=cluster_n)
+    return df, model, {"df": df_sec, "model": model_sec}
+
+
+# 클러스터 데이터 로드
+def load_df(cluster_n):
+    try:
+        return get_df(cluster_n)
+
+    except Exception as e:
+        st.error(f"데이터 로드 실패: {e}")
+        return None
+
+
+# 클러스터 모델 로드
+def load_model(cluster_n):
+    try:
+        return get_model(cluster_n)
+
+    except Exception as e:
+        st.error(f"저장소에서 클러스터 {cluster_n} 모델을 불러오는 중 오류 발생: {e}")
+        return None
+
+
+# 클러스터 데이터 + 모델 동시 로드
+def load_cluster_bundle(cluster_n):
+    try:
+        return get_cluster_bundle(cluster_n)
+
+    except Exception as e:
+        st.error(f"클러스터 {cluster_n} 데이터 / 모델 로드 실패: {e}")
+        return None, None, {}
+
+
+# =============================================================================
+# 예측 / 순위 결과 (클러스터, 데이터 버전, 모델 버전 기준)
+# =============================================================================
+
+# 후보 범위: history(과거에 나온 조합, 기본) / grid(범주 값의 전체 조합)
+PREDICTION_MODES = {
+    "history": lambda df, model: CandidatePredictions(predict_candidates(df, model)),
+    "grid": predict_grid,
+}
+
+
+def predictions_key(cluster_n, version, mode="history"):
+    kind = "predictions" if mode == "history" else f"{mode}_predictions"
+    return (kind, int(cluster_n)) + tuple(version)
+
+
+def ranking_key(cluster_n, version, highlight, k, mode="history"):
+    return ("ranking", int(cluster_n)) + tuple(version) + (highlight, k, mode)
+
+
+# 클러스터 예측 결과 (클러스터 / 데이터 / 모델 버전 / 후보 범위당 한 번)
+def load_predictions(cluster_n, df, model, mode="history", version=None):
+    if version is None:
+        version = cluster_version(cluster_n)
+    key = predictions_key(cluster_n, version, mode)
+    return cluster_cache.get_or_load(key, lambda: PREDICTION_MODES[mode](df, model))
+
+
+def _get_predictions_versioned(cluster_n, mode="history"):
+    # 반환값: (예측 결과, 예측에 쓴 버전) - 결과 키는 이 버전 하나로만 만든다
+    # (중간에 핫 리로드로 버전이 바뀌어도 이전 버전 결과가 새 버전 키에 저장되지 않도록)
+    version = cluster_version(cluster_n)
+    if None not in version:
+        predictions = cluster_cache.get(predictions_key(cluster_n, version, mode))
+        if predictions is not None:
+            return predictions, version
+
+    df, model, _ = get_cluster_bundle(cluster_n)
+    # 처음 로드한 경우 여기서 버전이 생긴다
+    version = cluster_version(cluster_n)
+    return load_predictions(cluster_n, df, model, mode, version), version
+
+
+def get_predictions(cluster_n, mode="history"):
+    # 이미 예측했다면 데이터 / 모델 로드 없이 캐시된 결과 사용
+    return _get_predictions_versioned(cluster_n, mode)[0]
+
+
+def get_ranking(cluster_n, highlight, k=TOP_K, mode="history"):
+    # HIGHLIGHT 별 상위 k 결과 - (클러스터, 데이터 버전, 모델 버전, HIGHLIGHT, k, 범위) 로만 조회
+    # 히트면 DataFrame 해싱 / 데이터·모델 로드 없이 모든 세션이 같은 결과를 공유 (수정 금지)
+    version = cluster_version(cluster_n)
+    if None not in version:
+        ranked = cluster_cache.get(ranking_key(cluster_n, version, highlight, k, mode))
+        if ranked is not None:
+            return ranked
+
+    # 다른 HIGHLIGHT 로 이미 예측했다면 재정렬만 - 예측과 같은 버전의 키로 저장
+    predictions, version = _get_predictions_versioned(cluster_n, mode)
+    ranked = predictions.rank(highlight, k=k)
+    if None not in version:
+        cluster_cache.put(
+            ranking_key(cluster_n, version, highlight, k, mode), ranked, priority=PRIORITY_DERIVED
+        )
+    return ranked
+
+
+def get_weighted_ranking(cluster_n, weights, k=TOP_K, mode="history"):
+    # 사용자 지정 가중치 - 캐시된 스케일 행렬에서 재정렬만 (예측 재실행 / 결과 캐시 없음)
+    return get_predictions(cluster_n, mode).top_k(normalize_weights(weights), k)
+
+
+# 여러 클러스터 동시 추천용 스레드 풀
+# (번들 로드가 _bundle_pool 을 쓰므로 같은 풀에서 기다리면 교착될 수 있어 분리)
+_ranking_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("IVE_RANKING_WORKERS", "4")),
+    thread_name_prefix="ive-ranking"
+)
+
+
+def get_rankings(clusters, highlight, weights=None, k=TOP_K, mode="history"):
+    # 클러스터별 상위 k - 고유 클러스터당 한 번만 로드 / 예측, 클러스터끼리는 병렬
+    # 기본 HIGHLIGHT 는 결과 캐시 경유, 그 외(프리셋 / 사용자 지정)는 weights 로 재정렬
+    # 반환값: {클러스터: 결과 DataFrame 또는 발생한 예외}
+    def rank(cluster_n):
+        if highlight in HIGHLIGHT_WEIGHTS:
+            return get_ranking(cluster_n, highlight, k, mode)
+        return get_weighted_ranking(cluster_n, weights, k, mode)
+
+    futures = {
+        cluster_n: _ranking_pool.submit(rank, cluster_n)
+        for cluster_n in dict.fromkeys(int(c) for c in clusters)
+    }
+
+    results = {}
+    for cluster_n, future in futures.items():
+        try:
+            results[cluster_n] = future.result()
+        except Exception as e:
+            results[cluster_n] = e
+    return results
+
+
+def load_ranking(cluster_n, highlight, k=TOP_K, mode="history"):
+    try:
+        return get_ranking(cluster_n, highlight, k, mode)
+
+    except Exception as e:
+        st.error(f"클러스터 {cluster_n} 추천 계산 실패: {e}")
+        return None
+
+
+def load_weighted_ranking(cluster_n, weights, k=TOP_K, mode="history"):
+    try:
+        return get_weighted_ranking(cluster_n, weights, k, mode)
+
+    except Exception as e:
+        st.error(f"클러스터 {cluster_n} 추천 계산 실패: {e}")
+        return None
+
+
+def warm_results(cluster_n, df, model, version, k=TOP_K):
+    # 주어진 버전의 예측 / 모든 HIGHLIGHT 순위를 미리 계산해서 캐시에 적재
+    predictions = CandidatePredictions(predict_candidates(df, model))
+    cluster_cache.put(predictions_key(cluster_n, version), predictions)
+    for highlight in HIGHLIGHT_WEIGHTS:
+        cluster_cache.put(
+            ranking_key(cluster_n, version, highlight, k),
+            predictions.rank(highlight, k=k),
+            priority=PRIORITY_DERIVED
+        )
+
+
+def evict_cluster(cluster_n):
+    # 클러스터의 데이터 / 모델 / 결과를 공유 캐시에서 제거 -> 다음 요청 때 최신 버전으로 로드
+    # (버전 기록은 그대로 두고, 다시 로드하면 _loaded 가 새 버전으로 덮어쓴다)
+    return cluster_cache.invalidate_where(
+        lambda key: isinstance(key, tuple) and len(key) > 1
+        and key[0] in ("df", "model", "predictions", "grid_predictions", "ranking")
+        and key[1] == int(cluster_n)
+    )
+
+
+def install_cluster(cluster_n, df, df_version, model, model_version):
+    # 새 버전 데이터 / 모델로 교체 (핫 리로드)
+    # 객체를 먼저 넣고 버전은 잠금 안에서 한 번에 전환 -> 이후 요청은 새 버전 키로만 조회
+    cluster_cache.put(("df", cluster_n), df, priority=PRIORITY_ROWS)
+    cluster_cache.put(("model", cluster_n), model, priority=PRIORITY_MODEL)
+    with _versions_lock:
+        _loaded_versions[("df", cluster_n)] = df_version
+        _loaded_versions[("model", cluster_n)] = model_version
+
+    # 이전 버전 결과 정리
+    current = (df_version, model_version)
+    return cluster_cache.invalidate_where(
+        lambda key: isinstance(key, tuple)
+        and key[:2] in (
+            ("predictions", int(cluster_n)), ("grid_predictions", int(cluster_n)), ("ranking", int(cluster_n))
+        )
+        and key[2:4] != current
+    )
@@ -0,0 +1,128 @@
+# =============================================================================
+# S3 객체 로컬 디스크 미러 (ETag 재검증)
+# =============================================================================
+
+import os
+import tempfile
+import threading
+
+from botocore.exceptions import ClientError
+
+from utils.metrics import metrics
+from utils.s3_client import BUCKET_NAME, get_s3_client
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "ive_s3_cache")
+CHUNK_SIZE = 1024 * 1024
+
+
+def _is_not_modified(error):
+    code = str(error.response.get('Error', {}).get('Code', ''))
+    status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode')
+    return status == 304 or code in ('304', 'NotModified')
+
+
+def is_missing(error):
+    code = str(error.response.get('Error', {}).get('Code', ''))
+    return code in ('NoSuchKey', '404', 'NotFound')
+
+
+def atomic_write_text(path, text):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class S3DiskMirror:
+    # {root}/{bucket}/{key} 에 본문, {key}.etag 에 ETag 저장
+    # - 로컬 사본이 있으면 If-None-Match 로 조건부 GET -> 304면 본문 전송 없음
+    # - 변경된 객체는 임시 파일에 받은 뒤 os.replace 로 원자적으로 교체
+
+    def __init__(self, root, bucket=BUCKET_NAME):
+        self.root = root
+        self.bucket = bucket
+        self._etags = {}
+        self._lock = threading.Lock()
+
+    def local_path(self, key):
+        return os.path.join(self.root, self.bucket, *key.split('/'))
+
+    def cached_etag(self, key):
+        # 마지막으로 확인한 ETag (메모리 -> 디스크 순)
+        with self._lock:
+            if key in self._etags:
+                return self._etags[key]
+
+        path = self.local_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path + ".etag", encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def remote_etag(self, key):
+        # 본문 없이 HEAD 요청으로 현재 ETag만 확인
+        with metrics.timer("s3_head", key=key):
+            response = get_s3_client().head_object(Bucket=self.bucket, Key=key)
+        return response.get('ETag', '')
+
+    def fetch(self, key):
+        path = self.local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        request = {'Bucket': self.bucket, 'Key': key}
+        # 메모리의 ETag 는 스트리밍 읽기 등에서도 기록되므로, 로컬 사본이 실제로 있을 때만 조건부 GET
+        # (tmp 정리 등으로 파일이 지워졌으면 304 대신 본문을 다시 받는다)
+        etag = self.cached_etag(key) if os.path.exists(path) else None
+        if etag:
+            request['IfNoneMatch'] = etag
+
+        try:
+            with metrics.timer("s3_get", key=key):
+                response = get_s3_client().get_object(**request)
+        except ClientError as e:
+            if etag and _is_not_modified(e):
+                metrics.incr("s3_not_modified_total")
+                self.remember(key, etag)
+                return path
+            raise
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with metrics.timer("s3_download", key=key), os.fdopen(fd, 'wb') as f:
+                for chunk in response['Body'].iter_chunks(CHUNK_SIZE):
+                    f.write(chunk)
+                    metrics.incr("s3_bytes_total", len(chunk))
+            # 본문을 먼저 교체하고 ETag를 기록 (중간에 실패해도 다음 요청에서 다시 받음)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        new_etag = response.get('ETag', '')
+        atomic_write_text(path + ".etag", new_etag)
+        self.remember(key, new_etag)
+        return path
+
+    def remember(self, key, etag):
+        # 미러를 거치지 않고 읽은 객체의 ETag 기록 (스트리밍 읽기 등)
+        with self._lock:
+            self._etags[key] = etag
+
+    def reset(self, root=None):
+        # 기억한 ETag 초기화 (root 지정 시 미러 위치 변경)
+        with self._lock:
+            self._etags.clear()
+            if root is not None:
+                self.root = root
+
+
+disk_mirror = S3DiskMirror(os.environ.get("IVE_DISK_CACHE_DIR", DEFAULT_CACHE_DIR))
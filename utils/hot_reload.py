@@ -0,0 +1,173 @@
+# =============================================================================
+# 원본 변경 감지 후 해당 클러스터만 다시 로드 (백그라운드)
+# =============================================================================
+# main.py 에서 IVE_HOT_RELOAD=1 일 때 시작
+# - IVE_RELOAD_INTERVAL(초, 기본 60)마다 로드된 클러스터의 데이터 / 모델 버전을 확인
+#   (S3 는 HEAD 요청만, 본문 없음)
+# - 바뀐 클러스터만 새 데이터 / 모델을 받아 예측과 HIGHLIGHT 별 순위까지 계산한 뒤
+#   install_cluster 로 한 번에 교체 -> 사용자는 교체 전까지 이전 결과, 이후에는
+#   이미 계산된 새 결과를 보므로 cold 경로를 거치지 않는다
+
+import logging
+import os
+import threading
+import time
+
+from utils.cache import cluster_cache
+from utils.data_loader import (
+    current_data_version, data_version, fetch_df_versioned, fetch_model_versioned,
+    evict_cluster, get_df, get_model, install_cluster, loaded_versions, model_version, warm_results
+)
+from utils.metrics import metrics
+from utils.partitioned_dataset import dataset_enabled, reset_dataset
+from utils.recommendation_store import refresh_sources
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 60
+
+
+class ReloadStatus:
+
+    def __init__(self, interval):
+        self._lock = threading.Lock()
+        self.interval = interval
+        self.polls = 0
+        self.reloads = 0
+        self.failures = 0
+        self.last_poll_at = None
+        self.last_reload = {}
+        self.errors = {}
+
+    def record_poll(self):
+        with self._lock:
+            self.polls += 1
+            self.last_poll_at = time.time()
+
+    def record_reload(self, cluster_n, changed, error=None):
+        with self._lock:
+            if error is not None:
+                self.failures += 1
+                self.errors[cluster_n] = str(error)
+                return
+            self.reloads += 1
+            self.errors.pop(cluster_n, None)
+            self.last_reload[cluster_n] = {"changed": changed, "at": time.time()}
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "interval_sec": self.interval,
+                "polls": self.polls,
+                "reloads": self.reloads,
+                "failures": self.failures,
+                "last_poll_at": self.last_poll_at,
+                "last_reload": dict(self.last_reload),
+                "errors": dict(self.errors),
+            }
+
+
+_status = None
+_start_lock = threading.Lock()
+
+
+def hot_reload_enabled():
+    return os.environ.get("IVE_HOT_RELOAD", "0") == "1"
+
+
+def changed_clusters():
+    # {클러스터: ["df", "model"] 중 바뀐 것} - 지금 공유 캐시에 올라 있는 객체만 확인
+    # (축출된 클러스터는 다음 요청 때 새 버전으로 로드되므로 HEAD / 재로드로 예산을 다시 채우지 않는다)
+    remote_version = {"df": data_version, "model": model_version}
+    changed = {}
+    for (kind, cluster_n), version in loaded_versions().items():
+        if (kind, cluster_n) not in cluster_cache:
+            continue
+        with metrics.timer("reload_check", kind=kind, cluster=cluster_n):
+            current = remote_version[kind](cluster_n)
+        if current != version:
+            changed.setdefault(cluster_n, []).append(kind)
+    return changed
+
+
+def reload_cluster(cluster_n, changed):
+    # 바뀐 쪽만 새로 받고 나머지는 사용 중인 객체 재사용
+    versions = loaded_versions()
+
+    with metrics.timer("reload_cluster", cluster=cluster_n):
+        if "df" in changed or ("df", cluster_n) not in versions:
+            df, df_version = fetch_df_versioned(cluster_n)
+        else:
+            df, df_version = get_df(cluster_n), versions.get(("df", cluster_n))
+
+        if "model" in changed or ("model", cluster_n) not in versions:
+            model, current_model_version = fetch_model_versioned(cluster_n)
+        else:
+            model, current_model_version = get_model(cluster_n), versions[("model", cluster_n)]
+        if hasattr(model, 'load_all'):
+            model.load_all()
+
+        warm_results(cluster_n, df, model, (df_version, current_model_version))
+        install_cluster(cluster_n, df, df_version, model, current_model_version)
+
+    # 이 클러스터의 버전 확인 캐시만 비운다 (TTL 동안 이전 버전을 보지 않도록)
+    # - 홈 페이지 요약 통계 / 사전 계산 산출물의 원본 비교가 새 버전을 바로 본다
+    if "df" in changed:
+        current_data_version.clear(int(cluster_n))
+    refresh_sources(cluster_n)
+    metrics.incr("hot_reload_total")
+
+
+def poll_once(status):
+    if dataset_enabled():
+        # 새 파티션 파일도 보이도록 목록을 다시 읽는다
+        reset_dataset()
+
+    changed = changed_clusters()
+    status.record_poll()
+
+    for cluster_n, kinds in changed.items():
+        if not all((kind, cluster_n) in cluster_cache for kind in ("df", "model")):
+            # 일부만 캐시에 남은 클러스터는 재로드하지 않고 제거만 (축출된 쪽을 다시 예산에 올리지 않음)
+            evict_cluster(cluster_n)
+            logger.info("hot reload: 클러스터 %s (%s) 캐시에서 제거", cluster_n, ", ".join(kinds))
+            continue
+        try:
+            reload_cluster(cluster_n, kinds)
+            status.record_reload(cluster_n, kinds)
+            logger.info("hot reload: 클러스터 %s (%s) 교체 완료", cluster_n, ", ".join(kinds))
+        except Exception as e:
+            logger.warning("hot reload: 클러스터 %s 교체 실패: %s", cluster_n, e)
+            status.record_reload(cluster_n, kinds, error=e)
+
+
+def _run(status):
+    while True:
+        time.sleep(status.interval)
+        try:
+            poll_once(status)
+        except Exception as e:
+            logger.warning("hot reload: 버전 확인 실패: %s", e)
+
+
+def start_hot_reload(interval=None):
+    # 프로세스당 한 번만 시작 (이후 호출은 기존 상태 반환)
+    global _status
+    with _start_lock:
+        if _status is not None:
+            return _status
+
+        if interval is None:
+            interval = float(os.environ.get("IVE_RELOAD_INTERVAL", DEFAULT_INTERVAL))
+
+        _status = ReloadStatus(interval)
+        metrics.register_source("hot_reload", _status.snapshot)
+        threading.Thread(
+            target=_run, args=(_status,),
+            name="ive-hot-reload", daemon=True
+        ).start()
+        return _status
+
+
+def reload_status():
+    return None if _status is None else _status.snapshot()
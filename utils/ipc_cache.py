@@ -0,0 +1,71 @@
+# =============================================================================
+# 호스트 공용 Arrow IPC 캐시 (디코딩된 클러스터 테이블, 메모리 매핑)
+# =============================================================================
+# 한 호스트에서 여러 Streamlit 프로세스를 띄우면 각자 같은 parquet 을 받아
+# 디코딩하므로 메모리가 프로세스 수만큼 늘어난다.
+# IVE_IPC_CACHE=1 이면 디코딩(compact_frame)까지 끝난 테이블을
+#   {IVE_IPC_CACHE_DIR}/{키}.{버전 해시}.arrow
+# 로 한 번만 저장하고, 모든 프로세스는 읽기 전용 메모리 매핑으로 사용한다.
+#   - 범주형은 dictionary, 지표는 float32 그대로 저장 (비압축) -> 디코딩 없음
+#   - 수치 컬럼은 매핑된 페이지를 그대로 가리키므로 OS 페이지 캐시를 공유
+#   - 버전(ETag 등)이 파일 이름에 들어가므로 원본이 바뀌면 새 파일을 만든다
+#     (이전 파일은 삭제해도 이미 매핑한 프로세스는 그대로 읽을 수 있음)
+
+import os
+import tempfile
+
+import pyarrow as pa
+
+from utils.metrics import metrics
+from utils.storage import IPC_SUFFIX, map_ipc_file, remove_stale_ipc, version_tag, write_ipc_file
+
+DEFAULT_IPC_CACHE_DIR = os.path.join(tempfile.gettempdir(), "ive_ipc_cache")
+
+
+class ArrowHostCache:
+
+    def __init__(self, root, enabled=True):
+        self.root = root
+        self.enabled = enabled
+
+    def _base_path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def path(self, key, version):
+        return f"{self._base_path(key)}.{version_tag(version)}{IPC_SUFFIX}"
+
+    def load(self, key, version):
+        # 해당 버전 파일이 있으면 매핑한 DataFrame, 없으면 None
+        if not version:
+            return None
+        path = self.path(key, version)
+        try:
+            table = map_ipc_file(path)
+        except FileNotFoundError:
+            metrics.incr("ipc_cache_misses_total")
+            return None
+
+        metrics.incr("ipc_cache_hits_total")
+        return self._to_pandas(table)
+
+    def store(self, key, version, df):
+        # 저장 후 매핑한 DataFrame 반환 (처음 디코딩한 프로세스도 같은 페이지를 사용)
+        if not version:
+            return df
+        path = self.path(key, version)
+        with metrics.timer("ipc_cache_write", key=key):
+            write_ipc_file(pa.Table.from_pandas(df, preserve_index=False), path)
+        remove_stale_ipc(self._base_path(key), path)
+        return self._to_pandas(map_ipc_file(path))
+
+    @staticmethod
+    def _to_pandas(table):
+        # split_blocks: 컬럼별 블록 -> null 없는 수치 컬럼은 복사 없이 매핑 버퍼 사용
+        with metrics.timer("ipc_to_pandas"):
+            return table.to_pandas(split_blocks=True)
+
+
+host_cache = ArrowHostCache(
+    os.environ.get("IVE_IPC_CACHE_DIR", DEFAULT_IPC_CACHE_DIR),
+    enabled=os.environ.get("IVE_IPC_CACHE", "0") == "1"
+)
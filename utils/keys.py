@@ -0,0 +1,38 @@
+# =============================================================================
+# 저장소 키 구조 (모든 백엔드 공통)
+# =============================================================================
+# S3 버킷 / 로컬 디렉터리 어디든 같은 상대 경로를 사용
+
+from utils.model_io import MANIFEST_NAME
+
+MAPPING_KEY = "ive_ml/Clustering/IVE_CLUSTER_MAPPING_MANUAL.parquet"
+
+# 단일 데이터셋 기본 위치 (jobs/build_cluster_dataset.py)
+DEFAULT_DATASET_KEY = "ive_ml/Clustering/IVE_ANALYTICS"
+
+RECOMMENDATION_KEY_TEMPLATE = "ive_ml/Recommendations/IVE_RECOMMENDATIONS_v{version}.parquet"
+
+
+def cluster_data_key(cluster_n):
+    return f"ive_ml/Clustering/IVE_ANALYTICS_CLUSTER_{cluster_n}.parquet"
+
+
+def cluster_summary_key(cluster_n):
+    return f"ive_ml/Clustering/IVE_ANALYTICS_CLUSTER_{cluster_n}_summary.json"
+
+
+def cluster_model_key(cluster_n):
+    return f"ive_ml/Models/Cluster_{cluster_n}_cat_re_models.pkl"
+
+
+# 네이티브(cbm) 모델 디렉터리 - jobs/convert_models.py 로 생성
+def cluster_model_prefix(cluster_n):
+    return f"ive_ml/Models/Cluster_{cluster_n}_cat_re_models"
+
+
+def cluster_model_manifest_key(cluster_n):
+    return f"{cluster_model_prefix(cluster_n)}/{MANIFEST_NAME}"
+
+
+def recommendation_key(version):
+    return RECOMMENDATION_KEY_TEMPLATE.format(version=version)
@@ -0,0 +1,100 @@
+# =============================================================================
+# (INDUSTRY, OS_TYPE, LIMIT_TYPE) -> GMM_CLUSTER 인덱스
+# =============================================================================
+
+import sys
+from types import MappingProxyType
+
+import pandas as pd
+
+KEY_COLUMNS = ['INDUSTRY', 'OS_TYPE', 'LIMIT_TYPE']
+
+# 화면 선택지 (사이드바 / 시나리오 비교 공용)
+INDUSTRY_OPTIONS = ["금융/보험", "커머스/유통","서비스", "게임", "교육/공공", "뷰티/헬스", "F&B/식품", "가전/제조"]
+OS_OPTIONS = ["WEB", "ANDROID", "IOS"]
+LIMIT_OPTIONS = ["UNLIMITED", "LIMITED"]
+
+
+def normalize_key(industry, os_type, limit_type):
+    # 사이드바 값과 매핑 데이터를 같은 규칙으로 정리 (OS만 소문자)
+    return (
+        str(industry).strip(),
+        str(os_type).strip().lower(),
+        str(limit_type).strip(),
+    )
+
+
+class MappingIndex:
+    # 매핑 데이터를 로드 시점에 한 번만 정리해서 해시 인덱스로 보관
+    # - lookup: O(1) 클러스터 조회
+    # - is_valid: 일부 조건만 고른 상태에서도 데이터가 있는 조합인지 확인
+
+    def __init__(self, mapping_df):
+        frame = pd.DataFrame({
+            'INDUSTRY': mapping_df['INDUSTRY'].astype(str).str.strip(),
+            'OS_TYPE': mapping_df['OS_TYPE'].astype(str).str.strip().str.lower(),
+            'LIMIT_TYPE': mapping_df['LIMIT_TYPE'].astype(str).str.strip(),
+            'GMM_CLUSTER': mapping_df['GMM_CLUSTER'],
+        }).dropna(subset=['GMM_CLUSTER'])
+        frame['GMM_CLUSTER'] = frame['GMM_CLUSTER'].astype(int)
+
+        index = {}
+        for row in frame[KEY_COLUMNS + ['GMM_CLUSTER']].itertuples(index=False):
+            # 같은 조합이 여러 번 나오면 첫 행 기준 (기존 values[0] 동작)
+            index.setdefault((row[0], row[1], row[2]), row[3])
+
+        prefixes = set()
+        for industry, os_type, limit_type in index:
+            prefixes.add((industry,))
+            prefixes.add((industry, os_type))
+            prefixes.add((industry, os_type, limit_type))
+
+        self._index = MappingProxyType(index)
+        self._prefixes = frozenset(prefixes)
+        self.combinations = frozenset(index)
+        self.clusters = tuple(sorted(set(index.values())))
+        # 차트용 정리된 매핑 데이터 (공유 객체이므로 수정하지 않는다)
+        self.frame = frame.reset_index(drop=True)
+        self._chart_counts = {
+            int(cluster_n): self._count_labels(group)
+            for cluster_n, group in self.frame.groupby('GMM_CLUSTER')
+        }
+
+    @staticmethod
+    def _count_labels(target_df):
+        # 클러스터 분석 차트용 (Label, Count, Category)
+        counts = []
+        for col, category in [('INDUSTRY', '산업군'), ('OS_TYPE', 'OS'), ('LIMIT_TYPE', '목표 제한 여부')]:
+            df_count = target_df[col].value_counts().reset_index()
+            df_count.columns = ['Label', 'Count']
+            df_count['Category'] = category
+            counts.append(df_count)
+        return pd.concat(counts, ignore_index=True)
+
+    def __len__(self):
+        return len(self._index)
+
+    def memory_bytes(self):
+        # 정리된 매핑 + 차트용 빈도 + 조회용 키 튜플(문자열 포함) 근사
+        frames = [self.frame, *self._chart_counts.values()]
+        size = sum(int(frame.memory_usage(index=True, deep=True).sum()) for frame in frames)
+        keys = sum(sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key) for key in self._prefixes)
+        return size + keys + sys.getsizeof(self._prefixes) + sys.getsizeof(dict(self._index))
+
+    def lookup(self, industry, os_type, limit_type):
+        return self._index.get(normalize_key(industry, os_type, limit_type))
+
+    def cluster_chart_counts(self, cluster_n):
+        # 로드 시점에 계산해 둔 클러스터별 빈도 (없으면 빈 DataFrame)
+        counts = self._chart_counts.get(int(cluster_n))
+        if counts is None:
+            return pd.DataFrame(columns=['Label', 'Count', 'Category'])
+        return counts
+
+    def is_valid(self, industry, os_type=None, limit_type=None):
+        key = normalize_key(industry, os_type or "", limit_type or "")
+        if os_type is None:
+            return key[:1] in self._prefixes
+        if limit_type is None:
+            return key[:2] in self._prefixes
+        return key in self._prefixes
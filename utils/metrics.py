@@ -0,0 +1,143 @@
+# =============================================================================
+# 단계별 지연 시간 / 카운터 수집
+# =============================================================================
+# - timer(stage): with 문 / 데코레이터로 소요 시간 기록 (최근 N건으로 p50/p99)
+# - incr(name, n): 캐시 히트, 다운로드 바이트 등 누적 카운터
+# - IVE_METRICS_LOG=1 이면 관측값마다 JSON 한 줄 로그 출력
+# - snapshot() / to_json() / to_prometheus() 로 내보내기
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+logger = logging.getLogger("ive.metrics")
+
+WINDOW_SIZE = 1024
+
+
+class MetricsRegistry:
+
+    def __init__(self, window_size=WINDOW_SIZE, log_events=False):
+        self._lock = threading.Lock()
+        self._window_size = window_size
+        self._samples = {}      # stage -> 최근 소요 시간(초)
+        self._counts = {}       # stage -> 전체 관측 수
+        self._totals = {}       # stage -> 전체 소요 시간 합
+        self._counters = {}
+        self._sources = {}      # 이름 -> stats() 를 반환하는 함수 (캐시 등)
+        self.log_events = log_events
+
+    def observe(self, stage, seconds, **fields):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self._window_size)
+            samples.append(seconds)
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+            self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+
+        if self.log_events:
+            logger.info(json.dumps(
+                {"ts": round(time.time(), 3), "stage": stage, "ms": round(seconds * 1000, 3), **fields},
+                ensure_ascii=False, default=str
+            ))
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, stage, **fields):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **fields)
+
+    def timed(self, stage):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def register_source(self, name, stats_func):
+        with self._lock:
+            self._sources[name] = stats_func
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._totals.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        with self._lock:
+            samples = {stage: np.fromiter(values, dtype=float) for stage, values in self._samples.items()}
+            counts = dict(self._counts)
+            totals = dict(self._totals)
+            counters = dict(self._counters)
+            sources = dict(self._sources)
+
+        stages = {}
+        for stage, values in sorted(samples.items()):
+            stages[stage] = {
+                "count": counts[stage],
+                "total_ms": round(totals[stage] * 1000, 3),
+                "p50_ms": round(float(np.percentile(values, 50)) * 1000, 3),
+                "p99_ms": round(float(np.percentile(values, 99)) * 1000, 3),
+                "max_ms": round(float(values.max()) * 1000, 3),
+            }
+        return {
+            "stages": stages,
+            "counters": counters,
+            "sources": {name: func() for name, func in sources.items()},
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2, default=str)
+
+    def to_prometheus(self, prefix="ive"):
+        snapshot = self.snapshot()
+        lines = [f"# TYPE {prefix}_stage_seconds summary"]
+        for stage, s in snapshot["stages"].items():
+            lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="0.5"}} {s["p50_ms"] / 1000}')
+            lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="0.99"}} {s["p99_ms"] / 1000}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {s["total_ms"] / 1000}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            lines.append(f"{prefix}_{name} {value}")
+
+        # 수치 값만 내보낸다 (문자열 / 리스트 / None 등은 JSON 내보내기에만 포함)
+        for source, stats in sorted(snapshot["sources"].items()):
+            for key, value in sorted(stats.items()):
+                if _is_number(value):
+                    lines.append(f'{prefix}_{source}_{key}{{source="{source}"}} {value}')
+                elif isinstance(value, dict):
+                    # 내역 (예: by_kind -> {종류: {"entries": n, "bytes": n}})
+                    for name, totals in sorted(value.items(), key=lambda item: str(item[0])):
+                        if not isinstance(totals, dict):
+                            continue
+                        for field, number in sorted(totals.items()):
+                            if _is_number(number):
+                                lines.append(f'{prefix}_{source}_{field}{{source="{source}",{key}="{name}"}} {number}')
+        return "\n".join(lines) + "\n"
+
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool)
+
+
+metrics = MetricsRegistry(log_events=os.environ.get("IVE_METRICS_LOG", "0") == "1")
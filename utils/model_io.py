@@ -0,0 +1,107 @@
+# =============================================================================
+# CatBoost 네이티브(cbm) 모델 번들
+# =============================================================================
+# 클러스터별 모델 디렉터리 구성
+#   {prefix}/manifest.json     타깃별 저장 형식
+#   {prefix}/{target}.cbm      CatBoost 네이티브 직렬화 모델
+# 상수 타깃(예측값이 고정)은 cbm 없이 manifest 안에 숫자로만 저장한다.
+
+import json
+import os
+import threading
+from collections.abc import Mapping
+
+from catboost import CatBoostRegressor
+
+from utils.metrics import metrics
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def target_file_name(target):
+    return f"{target}.cbm"
+
+
+class ModelBundle(Mapping):
+    # pickle dict 와 같은 인터페이스 (bundle['CVR'])
+    # 각 타깃 모델은 처음 접근할 때 로컬 파일에서 바로 역직렬화한다
+
+    def __init__(self, manifest, resolve_path):
+        # resolve_path: 파일 이름 -> 로컬 경로 (미러 / 로컬 디렉터리)
+        self._specs = dict(manifest['targets'])
+        self._paths = {
+            target: resolve_path(spec['file'])
+            for target, spec in self._specs.items()
+            if spec['type'] == 'catboost'
+        }
+        self._models = {}
+        self._lock = threading.Lock()
+        self.source_etag = manifest.get('source_etag')
+
+    def __getitem__(self, target):
+        spec = self._specs[target]
+        if spec['type'] == 'constant':
+            return spec['value']
+
+        model = self._models.get(target)
+        if model is None:
+            with self._lock:
+                model = self._models.get(target)
+                if model is None:
+                    with metrics.timer("cbm_load", target=target):
+                        model = CatBoostRegressor()
+                        model.load_model(self._paths[target], format='cbm')
+                    self._models[target] = model
+        return model
+
+    def load_all(self):
+        # 모든 타깃을 미리 역직렬화 (백그라운드 / 병렬 로드용)
+        for target in self._specs:
+            self[target]
+        return self
+
+    def __iter__(self):
+        return iter(self._specs)
+
+    def __len__(self):
+        return len(self._specs)
+
+    def memory_bytes(self):
+        # 역직렬화된 모델 크기는 cbm 파일 크기로 근사
+        return sum(os.path.getsize(path) for path in self._paths.values())
+
+
+def load_model_bundle(manifest_path, resolve_path):
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"지원하지 않는 모델 manifest 버전: {manifest.get('version')}")
+    return ModelBundle(manifest, resolve_path)
+
+
+def save_model_bundle(models, out_dir, source_etag=None):
+    # pickle dict({타깃: 모델 또는 상수}) -> manifest + cbm 파일
+    # 반환값: 저장한 파일 이름 목록 (manifest 가 마지막)
+    os.makedirs(out_dir, exist_ok=True)
+    targets = {}
+    written = []
+
+    for target, model in models.items():
+        if hasattr(model, 'save_model'):
+            file_name = target_file_name(target)
+            model.save_model(os.path.join(out_dir, file_name), format='cbm')
+            targets[target] = {'type': 'catboost', 'file': file_name}
+            written.append(file_name)
+        else:
+            targets[target] = {'type': 'constant', 'value': float(model)}
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source_etag': source_etag,
+        'targets': targets,
+    }
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    written.append(MANIFEST_NAME)
+    return written
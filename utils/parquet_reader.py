@@ -0,0 +1,53 @@
+# =============================================================================
+# S3 parquet 스트리밍 읽기 (ranged GET, 컬럼 / row group 선택)
+# =============================================================================
+# 전체 객체를 메모리로 받지 않고 footer 를 먼저 읽은 뒤
+# 요청한 컬럼 / 필터에 해당하는 row group 의 byte range 만 가져온다.
+
+import threading
+
+import pyarrow.parquet as pq
+import s3fs
+from pyarrow.fs import FSSpecHandler, PyFileSystem
+
+from utils.metrics import metrics
+from utils.s3_client import BUCKET_NAME, DEFAULT_REGION, get_secret
+
+_fs = None
+_fs_lock = threading.Lock()
+
+
+def get_s3fs():
+    global _fs
+    if _fs is None:
+        with _fs_lock:
+            if _fs is None:
+                # 블록 캐시 없이 pyarrow 가 요청한 byte range 만 GET
+                _fs = s3fs.S3FileSystem(
+                    key=get_secret("AWS_ACCESS_KEY_ID"),
+                    secret=get_secret("AWS_SECRET_ACCESS_KEY"),
+                    client_kwargs={
+                        "region_name": get_secret("AWS_DEFAULT_REGION", DEFAULT_REGION)
+                    },
+                    default_cache_type="none",
+                )
+    return _fs
+
+
+def read_parquet_streaming(key, columns=None, filters=None, bucket=BUCKET_NAME):
+    # 반환값: (pyarrow.Table, ETag)
+    # footer -> row group 통계로 필터링 -> 필요한 컬럼 청크만 묶어서(pre_buffer) 요청
+    fs = get_s3fs()
+    path = f"{bucket}/{key}"
+    etag = fs.info(path).get('ETag')
+
+    with metrics.timer("s3_stream_read", key=key):
+        table = pq.read_table(
+            path,
+            filesystem=PyFileSystem(FSSpecHandler(fs)),
+            columns=columns,
+            filters=filters,
+            pre_buffer=True,
+        )
+    metrics.incr("s3_stream_bytes_total", table.nbytes)
+    return table, etag
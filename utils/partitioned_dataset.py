@@ -0,0 +1,67 @@
+# =============================================================================
+# GMM_CLUSTER 기준 단일 데이터셋 (hive 파티션 / 정렬된 단일 파일)
+# =============================================================================
+# IVE_CLUSTER_DATASET 으로 저장소 키를 지정하면 클러스터별 parquet 대신 사용
+#   - 디렉터리: {key}/GMM_CLUSTER={n}/part-0.parquet (hive 파티션)
+#   - .parquet 파일: GMM_CLUSTER 로 정렬, 클러스터마다 별도 row group
+# GMM_CLUSTER 필터는 파티션 경로 / row group 통계로 내려가므로
+# 필요한 클러스터의 파일(또는 row group)만 읽는다.
+
+import os
+import threading
+
+import pyarrow.dataset as ds
+
+from utils.storage import get_storage
+
+CLUSTER_DATASET = os.environ.get("IVE_CLUSTER_DATASET", "")
+
+_dataset = None
+_dataset_lock = threading.Lock()
+
+
+def dataset_enabled():
+    return bool(CLUSTER_DATASET)
+
+
+def open_dataset(key=None, storage=None):
+    key = key or CLUSTER_DATASET
+    filesystem, base = (storage or get_storage()).arrow_filesystem()
+    path = f"{base}/{key}"
+
+    if key.endswith(".parquet"):
+        return ds.dataset(path, filesystem=filesystem, format='parquet')
+    return ds.dataset(path, filesystem=filesystem, format='parquet', partitioning='hive')
+
+
+def get_dataset():
+    # 파일 목록 조회(LIST)는 프로세스당 한 번, 새 파티션이 생기면 reset_dataset()
+    global _dataset
+    if _dataset is None:
+        with _dataset_lock:
+            if _dataset is None:
+                _dataset = open_dataset()
+    return _dataset
+
+
+def reset_dataset():
+    global _dataset
+    with _dataset_lock:
+        _dataset = None
+
+
+def cluster_filter(clusters):
+    return ds.field('GMM_CLUSTER').isin([int(c) for c in clusters])
+
+
+def read_clusters(clusters, columns=None):
+    # 여러 클러스터도 한 번의 스캔으로 읽는다 (pyarrow.Table)
+    return get_dataset().to_table(columns=columns, filter=cluster_filter(clusters))
+
+
+def cluster_version(cluster_n):
+    # 해당 클러스터가 들어 있는 파일들의 버전 (S3 는 HEAD, 목록 캐시 무시)
+    storage = get_storage()
+    fragments = get_dataset().get_fragments(filter=cluster_filter([cluster_n]))
+    versions = sorted(storage.version(storage.key_of(fragment.path)) for fragment in fragments)
+    return "|".join(versions)
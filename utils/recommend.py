@@ -0,0 +1,253 @@
+# =============================================================================
+# 추천 엔진 (예측 / 점수 / 순위)
+# =============================================================================
+# x : SHAPE, MDA, START_TIME -> CVR, 1000_W_EFFICIENCY, ATS 예측
+
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from utils.metrics import metrics
+
+FEATURE_COLUMNS = ['SHAPE', 'MDA', 'START_TIME']
+
+TARGETS = {
+    'CVR': 'Pred_CVR',
+    '1000_W_EFFICIENCY': 'Pred_EFF',
+    'ATS': 'Pred_ATS'
+}
+
+SCALED_COLUMNS = ['CVR_scaled', 'EFF_scaled', 'ATS_scaled']
+
+# 페이지에 표시하는 후보 수 (TOP 10 표)
+TOP_K = 10
+
+# 전체 조합(SHAPE x MDA x START_TIME) 탐색 - 청크 크기 / 최대 조합 수
+GRID_CHUNK_ROWS = int(os.environ.get("IVE_GRID_CHUNK_ROWS", "65536"))
+GRID_MAX_ROWS = int(os.environ.get("IVE_GRID_MAX_ROWS", "2000000"))
+
+# 중점 사항에 따른 가중치 (CVR, EFF, ATS)
+HIGHLIGHT_WEIGHTS = {
+    "이익": (0.5, 0.25, 0.25),
+    "비용": (0.25, 0.5, 0.25),
+    "안정성": (0.25, 0.25, 0.5),
+}
+
+
+def normalize_weights(weights):
+    # 사용자 지정 가중치 (CVR, EFF, ATS) -> 합이 1 (점수를 0~100 범위로 유지), 모두 0이면 균등
+    values = np.asarray(weights, dtype=np.float64)
+    if not np.isfinite(values).all():
+        raise ValueError(f"가중치는 유한한 숫자여야 합니다: {list(weights)}")
+    values = np.clip(values, 0, None)
+    total = values.sum()
+    if total <= 0:
+        return (1 / 3,) * 3
+    return tuple(float(v) for v in values / total)
+
+
+def predict_candidates(df, model):
+    # 과거에 나온 조합별로 세 지표를 예측하고 0~100으로 스케일링
+    # 범주형 컬럼은 코드 그대로 모델에 넣고, 표시용 MDA 는 범주 이름만 문자열로 변경
+    unique_conditions = df[FEATURE_COLUMNS].drop_duplicates()
+    result_df = unique_conditions.copy()
+    if isinstance(result_df['MDA'].dtype, pd.CategoricalDtype):
+        result_df['MDA'] = result_df['MDA'].cat.rename_categories(
+            result_df['MDA'].cat.categories.astype(str)
+        )
+    else:
+        result_df['MDA'] = result_df['MDA'].astype(str)
+
+    for model_key_name, col_name in TARGETS.items():
+        target_model = model[model_key_name]
+
+        if hasattr(target_model, 'predict'):
+            with metrics.timer("catboost_predict", target=model_key_name, rows=len(unique_conditions)):
+                result_df[col_name] = target_model.predict(unique_conditions)
+        else:
+            result_df[col_name] = float(target_model)
+
+    with metrics.timer("minmax_scale"):
+        scaler = MinMaxScaler(feature_range=(0, 100))
+        scaled_vals = scaler.fit_transform(result_df[list(TARGETS.values())])
+    result_df['CVR_scaled'] = scaled_vals[:, 0]
+    result_df['EFF_scaled'] = scaled_vals[:, 1]
+    result_df['ATS_scaled'] = scaled_vals[:, 2]
+    return result_df
+
+
+class CandidatePredictions:
+    # 클러스터 / 모델 버전당 한 번만 계산하는 예측 결과
+    # - frame: 후보 조합 + Pred_* + *_scaled
+    # - matrix: (후보 수 x 3) 스케일 행렬, HIGHLIGHT 변경 시 행렬-벡터 곱만 수행
+
+    def __init__(self, result_df):
+        self.frame = result_df.reset_index(drop=True)
+        self.matrix = np.ascontiguousarray(
+            self.frame[SCALED_COLUMNS].to_numpy(dtype=np.float64)
+        )
+
+    def __len__(self):
+        return len(self.frame)
+
+    def memory_bytes(self):
+        return int(self.frame.memory_usage(index=True, deep=True).sum()) + self.matrix.nbytes
+
+    def scores(self, weights):
+        return self.matrix @ np.asarray(weights, dtype=np.float64)
+
+    def top_k(self, weights, k=None):
+        # 점수 상위 k개 후보 (k=None이면 전체), 점수 내림차순
+        with metrics.timer("top_k", rows=len(self)):
+            scores = self.scores(weights)
+            idx = top_k_indices(scores, len(scores) if k is None else k)
+            ranked = self.frame.iloc[idx].copy()
+            ranked['score'] = scores[idx]
+        return ranked
+
+    def rank(self, highlight, k=None):
+        return self.top_k(HIGHLIGHT_WEIGHTS[highlight], k)
+
+
+# =============================================================================
+# 전체 조합 탐색 (과거에 없던 조합 포함)
+# =============================================================================
+
+def _feature_levels(df):
+    # 클러스터에 등장한 범주 값 (범주형이면 사용된 범주만)
+    levels = {}
+    for col in FEATURE_COLUMNS:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            levels[col] = values.cat.remove_unused_categories().cat.categories
+        else:
+            levels[col] = pd.Index(pd.unique(values.dropna()))
+    return levels
+
+
+def candidate_grid_size(df):
+    return int(np.prod([len(level) for level in _feature_levels(df).values()]))
+
+
+def _grid_chunk(levels, shape, start, stop):
+    # 조합 번호 [start, stop) -> 모델 입력 DataFrame (범주 코드로 바로 구성)
+    codes = np.unravel_index(np.arange(start, stop), shape)
+    return pd.DataFrame({
+        col: pd.Categorical.from_codes(code, categories=levels[col])
+        for col, code in zip(FEATURE_COLUMNS, codes)
+    })
+
+
+def _minmax_scale(values):
+    # MinMaxScaler(0~100) 와 같은 규칙 (값 범위가 0이면 0)
+    low = values.min(axis=0)
+    span = values.max(axis=0) - low
+    span[span == 0] = 1
+    return ((values - low) / span * 100).astype(np.float32)
+
+
+def predict_grid(df, model, chunk_rows=GRID_CHUNK_ROWS, max_rows=GRID_MAX_ROWS):
+    # 모든 조합을 청크 단위로 예측, 청크 DataFrame 은 버리고 float32 예측값만 보관
+    # (전체 min-max 스케일링에 모든 예측값이 필요하므로 조합 수 x 3 행렬은 유지)
+    levels = _feature_levels(df)
+    shape = tuple(len(levels[col]) for col in FEATURE_COLUMNS)
+    n_rows = int(np.prod(shape))
+    if n_rows > max_rows:
+        raise ValueError(f"조합 수 {n_rows:,} 개가 최대 {max_rows:,} 개를 넘습니다")
+
+    preds = np.empty((n_rows, len(TARGETS)), dtype=np.float32)
+    with metrics.timer("grid_predict", rows=n_rows):
+        for start in range(0, n_rows, chunk_rows):
+            stop = min(start + chunk_rows, n_rows)
+            chunk = _grid_chunk(levels, shape, start, stop)
+            for j, target in enumerate(TARGETS):
+                target_model = model[target]
+                if hasattr(target_model, 'predict'):
+                    preds[start:stop, j] = target_model.predict(chunk)
+                else:
+                    preds[start:stop, j] = float(target_model)
+
+    with metrics.timer("minmax_scale"):
+        scaled = _minmax_scale(preds)
+    return GridPredictions(levels, shape, preds, scaled)
+
+
+class GridPredictions:
+    # CandidatePredictions 와 같은 인터페이스 (rank / top_k / scores)
+    # 조합은 번호로만 보관하고 상위 k개만 SHAPE / MDA / START_TIME 으로 복원
+
+    def __init__(self, levels, shape, preds, scaled):
+        self.levels = levels
+        self.shape = shape
+        self.preds = preds
+        self.matrix = scaled
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def memory_bytes(self):
+        return self.preds.nbytes + self.matrix.nbytes
+
+    def scores(self, weights):
+        return self.matrix @ np.asarray(weights, dtype=np.float32)
+
+    def top_k(self, weights, k=None):
+        with metrics.timer("top_k", rows=len(self)):
+            scores = self.scores(weights)
+            idx = top_k_indices(scores, len(scores) if k is None else k)
+            codes = np.unravel_index(idx, self.shape)
+
+            ranked = pd.DataFrame({
+                col: np.asarray(self.levels[col])[code]
+                for col, code in zip(FEATURE_COLUMNS, codes)
+            }, index=idx)
+            ranked['MDA'] = ranked['MDA'].astype(str)
+            for j, col in enumerate(TARGETS.values()):
+                ranked[col] = self.preds[idx, j].astype(np.float64)
+            for j, col in enumerate(SCALED_COLUMNS):
+                ranked[col] = self.matrix[idx, j].astype(np.float64)
+            ranked['score'] = scores[idx].astype(np.float64)
+        return ranked
+
+    def rank(self, highlight, k=None):
+        return self.top_k(HIGHLIGHT_WEIGHTS[highlight], k)
+
+
+def top_k_indices(scores, k):
+    # 전체 정렬 대신 부분 선택(argpartition) 후 상위 k개만 정렬
+    n = len(scores)
+    k = max(0, min(int(k), n))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+
+    if k < n:
+        idx = np.argpartition(-scores, k - 1)[:k]
+    else:
+        idx = np.arange(n)
+    return idx[np.argsort(-scores[idx], kind='stable')]
+
+
+def split_top(ranked):
+    # 페이지에서 쓰는 형태 (TOP 1/2/3 단일 행, TOP 3, TOP 10)
+    # ranked 는 이미 점수순이므로 앞에서부터 자르기만 한다
+    top_10 = ranked.head(10).copy()
+    top = ranked.head(3).copy()
+
+    top['rank_label'] = list(range(1, len(top) + 1))
+    top1 = top[top['rank_label']==1].reset_index(drop=True)
+    top2 = top[top['rank_label']==2].reset_index(drop=True)
+    top3 = top[top['rank_label']==3].reset_index(drop=True)
+
+    return top1, top2, top3, top, top_10
+
+
+def budget_split(scores):
+    # 예산 배분 비율 (%) - 점수 비례 100% 분할, 소수 첫째 자리
+    # 점수 합이 0 이거나 유한하지 않으면 (예: 상수 타깃에만 가중치) 균등 분할
+    total = scores.sum()
+    if len(scores) and (not np.isfinite(total) or total <= 0):
+        rates = np.full(len(scores), round(100 / len(scores), 1))
+        return pd.Series(rates, index=scores.index) if isinstance(scores, pd.Series) else rates
+    return (scores / total * 100).round(1)
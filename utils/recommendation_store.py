@@ -0,0 +1,186 @@
+# =============================================================================
+# 사전 계산된 추천 결과 (배치 산출물) 조회
+# =============================================================================
+# 배치 작업(jobs/precompute_recommendations.py)이 모든 클러스터 x HIGHLIGHT 의
+# 전체 순위 테이블을 하나의 parquet으로 저장하고, 페이지는 여기서 조회만 한다.
+
+import json
+import logging
+from io import BytesIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from utils.cache import PRIORITY_INDEX, cluster_cache
+from utils.data_loader import data_version
+from utils.keys import cluster_model_key, recommendation_key
+from utils.recommend import HIGHLIGHT_WEIGHTS, CandidatePredictions, predict_candidates
+from utils.storage import get_storage, is_missing
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 1
+RECOMMENDATION_KEY = recommendation_key(ARTIFACT_VERSION)
+
+# 산출물 / 원본 ETag 재확인 주기 (초)
+STALE_CHECK_TTL = 300
+
+OUTPUT_COLUMNS = [
+    'SHAPE', 'MDA', 'START_TIME',
+    'Pred_CVR', 'Pred_EFF', 'Pred_ATS',
+    'CVR_scaled', 'EFF_scaled', 'ATS_scaled', 'score'
+]
+
+
+# =============================================================================
+# 생성 (배치)
+# =============================================================================
+
+def build_cluster_recommendations(cluster_n, df, model):
+    # 한 클러스터의 HIGHLIGHT별 전체 순위 테이블 (long format)
+    predictions = CandidatePredictions(predict_candidates(df, model))
+
+    frames = []
+    for highlight in HIGHLIGHT_WEIGHTS:
+        ranked = predictions.rank(highlight)[OUTPUT_COLUMNS].reset_index(drop=True)
+        ranked.insert(0, 'RANK', range(1, len(ranked) + 1))
+        ranked.insert(0, 'HIGHLIGHT', highlight)
+        ranked.insert(0, 'GMM_CLUSTER', int(cluster_n))
+        frames.append(ranked)
+    return pd.concat(frames, ignore_index=True)
+
+
+def to_artifact_bytes(frame, sources):
+    # sources: {cluster: {"data_etag": ..., "model_etag": ...}}
+    frame = frame.astype({'HIGHLIGHT': 'category', 'SHAPE': 'category',
+                          'MDA': 'category', 'START_TIME': 'category'})
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'ive_artifact_version'] = str(ARTIFACT_VERSION).encode()
+    metadata[b'ive_sources'] = json.dumps(
+        {str(k): v for k, v in sources.items()}
+    ).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    buffer = BytesIO()
+    pq.write_table(table, buffer, compression='zstd')
+    return buffer.getvalue()
+
+
+# =============================================================================
+# 조회 (페이지)
+# =============================================================================
+
+class RecommendationArtifact:
+
+    def __init__(self, table):
+        metadata = table.schema.metadata or {}
+        self.version = int(metadata.get(b'ive_artifact_version', b'0'))
+        self.sources = {
+            int(k): v for k, v in json.loads(metadata.get(b'ive_sources', b'{}')).items()
+        }
+
+        frame = table.to_pandas()
+        for col in ['HIGHLIGHT', 'SHAPE', 'MDA', 'START_TIME']:
+            frame[col] = frame[col].astype(str)
+
+        self._groups = {
+            (int(cluster_n), highlight): group[OUTPUT_COLUMNS].reset_index(drop=True)
+            for (cluster_n, highlight), group in frame.groupby(
+                ['GMM_CLUSTER', 'HIGHLIGHT'], sort=False
+            )
+        }
+
+    def get(self, cluster_n, highlight):
+        return self._groups.get((int(cluster_n), highlight))
+
+    def memory_bytes(self):
+        return sum(int(group.memory_usage(index=True, deep=True).sum()) for group in self._groups.values())
+
+
+@st.cache_data(ttl=STALE_CHECK_TTL, show_spinner=False)
+def _current_artifact_version():
+    try:
+        return get_storage().version(RECOMMENDATION_KEY)
+    except Exception as e:
+        # 산출물이 아직 없으면 None (TTL 동안 캐시) -> 실시간 추론으로 대체
+        if is_missing(e):
+            return None
+        raise
+
+
+def _read_artifact():
+    artifact = RecommendationArtifact(pq.read_table(get_storage().path(RECOMMENDATION_KEY)))
+    if artifact.version != ARTIFACT_VERSION:
+        return None
+    return artifact
+
+
+_artifact_key = None
+# 읽기에 실패한 산출물 버전 (새 버전이 올라오기 전까지 재시도하지 않음)
+_failed_artifact_key = None
+
+
+def _load_artifact():
+    # 산출물 버전별로 메모리 예산(cluster_cache) 안에 보관, 새 버전이 나오면 이전 것은 제거
+    global _artifact_key, _failed_artifact_key
+    version = _current_artifact_version()
+    if version is None:
+        return None
+
+    key = ("recommendations", version)
+    if key == _failed_artifact_key:
+        return None
+
+    if _artifact_key not in (None, key):
+        cluster_cache.invalidate(_artifact_key)
+    _artifact_key = key
+    try:
+        return cluster_cache.get_or_load(key, _read_artifact, priority=PRIORITY_INDEX)
+    except Exception as e:
+        if not is_missing(e):
+            _failed_artifact_key = key
+        raise
+
+
+def current_sources(cluster_n):
+    # 원본(클러스터 parquet, 모델 pickle)의 현재 버전 - S3 는 HEAD 요청만 사용
+    # 네이티브 모델은 pickle에서 변환한 파생물이므로 기준은 pickle ETag
+    return {
+        "data_etag": data_version(cluster_n),
+        "model_etag": get_storage().version(cluster_model_key(cluster_n)),
+    }
+
+
+@st.cache_data(ttl=STALE_CHECK_TTL, show_spinner=False)
+def _cached_current_sources(cluster_n):
+    return current_sources(cluster_n)
+
+
+def refresh_sources(cluster_n):
+    # 핫 리로드로 교체된 클러스터의 원본 버전을 다음 조회 때 다시 확인
+    _cached_current_sources.clear(int(cluster_n))
+
+
+def lookup_recommendations(cluster_n, highlight):
+    # 최신 산출물이 있으면 순위 테이블, 없거나 오래되었으면 None
+    try:
+        artifact = _load_artifact()
+        if artifact is None:
+            return None
+
+        ranked = artifact.get(cluster_n, highlight)
+        if ranked is None:
+            return None
+
+        if artifact.sources.get(int(cluster_n)) != _cached_current_sources(cluster_n):
+            return None
+        return ranked
+
+    except Exception as e:
+        # 산출물이 없으면 조용히, 그 외(손상 / 권한 / 버그)는 기록 후 실시간 추론으로 대체
+        if not is_missing(e):
+            logger.warning("추천 산출물 조회 실패 (클러스터 %s): %s", cluster_n, e)
+        return None
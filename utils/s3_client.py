@@ -0,0 +1,57 @@
+# =============================================================================
+# S3 클라이언트 (프로세스당 1개 공유)
+# =============================================================================
+
+import os
+import threading
+
+import boto3
+import streamlit as st
+from botocore.config import Config
+
+BUCKET_NAME = "ivekorea-airflow-practice-taeeunk"
+DEFAULT_REGION = "ap-southeast-2"
+
+# 연결 풀 / keep-alive 설정
+# - 동시 세션이 많아도 TLS 연결을 재사용하도록 풀 크기를 넉넉하게 잡는다
+S3_CONFIG = Config(
+    max_pool_connections=int(os.environ.get("IVE_S3_MAX_POOL_CONNECTIONS", "32")),
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=60,
+    retries={"max_attempts": 3, "mode": "standard"},
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_secret(name, default=None):
+    # st.secrets 우선, 없으면 환경 변수 사용
+    try:
+        return st.secrets[name]
+    except Exception:
+        return os.environ.get(name, default)
+
+
+def get_s3_client():
+    # boto3 클라이언트는 스레드 안전하지만 생성(기본 세션)은 그렇지 않으므로
+    # 잠금 안에서 전용 Session으로 한 번만 만든다
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                session = boto3.session.Session(
+                    aws_access_key_id=get_secret("AWS_ACCESS_KEY_ID"),
+                    aws_secret_access_key=get_secret("AWS_SECRET_ACCESS_KEY"),
+                    region_name=get_secret("AWS_DEFAULT_REGION", DEFAULT_REGION),
+                )
+                _client = session.client('s3', config=S3_CONFIG)
+    return _client
+
+
+def set_s3_client(client):
+    # 로컬 S3 대체 클라이언트 주입 (벤치마크 / 오프라인 실행용)
+    global _client
+    with _client_lock:
+        _client = client
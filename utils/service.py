@@ -0,0 +1,267 @@
+# =============================================================================
+# 추천 엔진 - Streamlit 밖에서 쓰는 API / HTTP JSON 엔드포인트
+# =============================================================================
+# 실행: python -m utils.service [--host 127.0.0.1] [--port 8600] [--workers 16]
+# - recommend(): 매핑 조회 -> 클러스터 로드 -> 예측 -> 점수 / 상위 k -> 예산 배분 (TOP_3 페이지와 동일)
+# - 페이지와 같은 프로세스 공유 캐시(cluster_cache) 사용, st.error 래퍼 대신 예외를 그대로 올린다
+# - HTTP 요청은 고정 크기 스레드 풀에서 처리 (요청마다 스레드를 만들지 않음)
+#
+#   GET  /recommend?industry=게임&os=IOS&limit=LIMITED&highlight=이익&k=10
+#   GET  /recommend?...&weights=0.5,0.3,0.2        (사용자 지정 가중치)
+#   POST /recommend  {"industry": ..., "os": ..., "limit": ..., "highlight" | "weights", "k", "full_grid"}
+#   GET  /health, GET /metrics (Prometheus 텍스트)
+
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from utils.data_loader import get_mapping_index, get_ranking, get_weighted_ranking
+from utils.hot_reload import hot_reload_enabled, start_hot_reload
+from utils.metrics import metrics
+from utils.recommend import HIGHLIGHT_WEIGHTS, TOP_K, budget_split, normalize_weights
+from utils.recommendation_store import lookup_recommendations
+from utils.warmup import start_warmup, warmup_enabled, warmup_status
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = int(os.environ.get("IVE_SERVICE_WORKERS", "16"))
+
+# 응답에 넣는 열 (스케일 값 등 내부 열은 제외)
+RESULT_COLUMNS = ['SHAPE', 'MDA', 'START_TIME', 'Pred_CVR', 'Pred_EFF', 'Pred_ATS', 'score']
+
+
+class ScenarioNotFound(LookupError):
+    # 매핑 데이터에 없는 (INDUSTRY, OS_TYPE, LIMIT_TYPE) 조합
+    pass
+
+
+# =============================================================================
+# Python API
+# =============================================================================
+
+def _records(ranked, n):
+    # 작은 결과라 DataFrame 연산 대신 열 단위 tolist (파이썬 기본형, 요청당 pandas 오버헤드 최소화)
+    head = ranked.head(n)
+    columns = [column for column in RESULT_COLUMNS if column in head.columns]
+    values = [head[column].tolist() for column in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+@metrics.timed("service_recommend")
+def recommend(industry, os_type, limit_type, highlight="이익", weights=None, k=TOP_K, full_grid=False):
+    # weights (CVR, EFF, ATS) 를 주면 highlight 대신 사용
+    # 반환값: {"cluster", "highlight", "weights", "top3": [...budget_rate 포함], "top10": [...]}
+    cluster_n = get_mapping_index().lookup(industry, os_type, limit_type)
+    if cluster_n is None:
+        raise ScenarioNotFound(f"데이터가 없는 조합입니다: {industry} / {os_type} / {limit_type}")
+    cluster_n = int(cluster_n)
+
+    k = int(k)
+    if not 1 <= k <= TOP_K:
+        raise ValueError(f"k 는 1~{TOP_K} 사이여야 합니다: {k}")
+    mode = "grid" if full_grid else "history"
+
+    if weights is not None:
+        if len(weights) != 3:
+            raise ValueError("weights 는 (CVR, EFF, ATS) 세 값이어야 합니다")
+        weights = normalize_weights(weights)
+        highlight = None
+        ranked = get_weighted_ranking(cluster_n, weights, TOP_K, mode)
+    elif highlight in HIGHLIGHT_WEIGHTS:
+        weights = HIGHLIGHT_WEIGHTS[highlight]
+        # 페이지와 같은 순서 - 사전 계산 산출물 우선, 없으면 실시간 추론
+        ranked = None if full_grid else lookup_recommendations(cluster_n, highlight)
+        if ranked is None:
+            ranked = get_ranking(cluster_n, highlight, TOP_K, mode)
+    else:
+        raise ValueError(f"알 수 없는 HIGHLIGHT: {highlight} (가능: {', '.join(HIGHLIGHT_WEIGHTS)})")
+
+    # ranked 는 이미 점수순 (split_top 과 같은 기준으로 앞에서부터 자르기만)
+    top10 = _records(ranked, k)
+    top3 = _records(ranked, 3)
+    rates = budget_split(np.array([record['score'] for record in top3]))
+    for record, rate in zip(top3, rates):
+        record['budget_rate'] = float(rate)
+
+    return {
+        "cluster": cluster_n,
+        "highlight": highlight,
+        "weights": list(weights),
+        "top3": top3,
+        "top10": top10,
+    }
+
+
+# =============================================================================
+# HTTP JSON 엔드포인트
+# =============================================================================
+
+def _parse_weights(value):
+    if value is None:
+        return None
+    parts = value if isinstance(value, (list, tuple)) else str(value).split(",")
+    try:
+        return [float(part) for part in parts]
+    except (TypeError, ValueError):
+        raise ValueError(f"weights 는 쉼표로 구분한 숫자여야 합니다: {value}")
+
+
+def _parse_int(name, value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} 는 정수여야 합니다: {value}")
+
+
+def _parse_flag(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def recommend_from_params(params):
+    # 쿼리 문자열 / JSON 본문 공용 - os / limit 은 짧은 이름도 허용
+    try:
+        industry = params['industry']
+        os_type = params.get('os', params.get('os_type'))
+        limit_type = params.get('limit', params.get('limit_type'))
+    except KeyError as e:
+        raise ValueError(f"필수 파라미터 누락: {e.args[0]}")
+    if os_type is None or limit_type is None:
+        raise ValueError("필수 파라미터 누락: os, limit")
+
+    # JSON 본문은 타입이 제각각이므로 여기서 검증 (형식 오류는 500 이 아니라 400)
+    values = {'industry': industry, 'os': os_type, 'limit': limit_type, 'highlight': params.get('highlight', "이익")}
+    for name, value in values.items():
+        if not isinstance(value, str):
+            raise ValueError(f"{name} 는 문자열이어야 합니다: {value!r}")
+
+    return recommend(
+        industry, os_type, limit_type,
+        highlight=values['highlight'],
+        weights=_parse_weights(params.get('weights')),
+        k=_parse_int('k', params.get('k', TOP_K)),
+        full_grid=_parse_flag(params.get('full_grid', False)),
+    )
+
+
+class RecommendationHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # keep-alive 연결이 작업 스레드를 오래 붙잡지 않도록
+    timeout = 5
+
+    def _send(self, status, body, content_type="application/json; charset=utf-8"):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _recommend(self, params):
+        try:
+            self._send(200, recommend_from_params(params))
+        except ScenarioNotFound as e:
+            self._send(404, {"error": str(e)})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            logger.exception("recommend 실패: %s", params)
+            self._send(500, {"error": str(e)})
+        metrics.incr("service_requests_total")
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/recommend":
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            self._recommend(params)
+        elif url.path == "/health":
+            self._send(200, {"status": "ok", "warmup": warmup_status()})
+        elif url.path == "/metrics":
+            self._send(200, metrics.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._send(404, {"error": f"없는 경로: {url.path}"})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/recommend":
+            self._send(404, {"error": f"없는 경로: {self.path}"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            self._send(400, {"error": f"JSON 파싱 실패: {e}"})
+            return
+        if not isinstance(params, dict):
+            self._send(400, {"error": "JSON 객체가 필요합니다"})
+            return
+        self._recommend(params)
+
+    def log_message(self, format, *args):
+        # 요청마다 stderr 에 찍지 않음
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class PooledHTTPServer(HTTPServer):
+    # ThreadingMixIn 과 같은 처리 방식이지만 고정 크기 스레드 풀 사용
+    daemon_threads = True
+
+    def __init__(self, address, handler_class, workers=DEFAULT_WORKERS):
+        super().__init__(address, handler_class)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ive-service")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def create_server(host="127.0.0.1", port=8600, workers=DEFAULT_WORKERS):
+    return PooledHTTPServer((host, port), RecommendationHandler, workers=workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="추천 결과 HTTP JSON 엔드포인트")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="요청 처리 스레드 수")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    # 페이지와 같은 환경 변수로 사전 로드 / 핫 리로드
+    if warmup_enabled():
+        start_warmup()
+    if hot_reload_enabled():
+        start_hot_reload()
+
+    server = create_server(args.host, args.port, args.workers)
+    logger.info("listening on http://%s:%d (workers=%d)", args.host, args.port, args.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
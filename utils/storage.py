@@ -0,0 +1,266 @@
+# =============================================================================
+# 저장소 백엔드 (S3 / 로컬 디렉터리 / 메모리 매핑 Arrow IPC)
+# =============================================================================
+# IVE_STORAGE 로 선택, 키 구조(utils/keys.py)는 백엔드와 무관하게 동일
+#   - s3   : 버킷 객체를 로컬 디스크 미러(ETag 재검증)로 받아서 사용 (기본)
+#   - local: IVE_STORAGE_ROOT 디렉터리의 파일을 그대로 사용 (온프레미스 복제본, 오프라인 실행)
+#   - arrow: local 과 같되 parquet 테이블은 옆에 만든 Arrow IPC(.arrow) 파일을
+#            메모리 매핑해서 읽음 (디코딩 / 복사 없음)
+#
+# 백엔드 공통 메서드
+#   path(key)            -> 읽을 수 있는 로컬 파일 경로
+#   read_table(key, ...) -> (pyarrow.Table, 버전)
+#   version(key)         -> 현재 버전 (S3: HEAD ETag, 로컬: mtime/크기)
+#   cached_version(key)  -> 마지막으로 확인한 버전
+#   remember(key, v)     -> 다른 경로로 읽은 객체의 버전 기록
+#   put(key, body)       -> 배치 산출물 저장
+#   arrow_filesystem()   -> (pyarrow FileSystem, 기준 경로) - 데이터셋 스캔용
+
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from botocore.exceptions import ClientError
+from pyarrow.fs import FSSpecHandler, LocalFileSystem, PyFileSystem
+
+from utils.disk_cache import S3DiskMirror, disk_mirror, is_missing as is_missing_object
+from utils.metrics import metrics
+from utils.parquet_reader import get_s3fs, read_parquet_streaming
+from utils.s3_client import BUCKET_NAME, get_s3_client, get_secret
+
+STORAGE_BACKEND = os.environ.get("IVE_STORAGE", "s3")
+STORAGE_ROOT = os.environ.get("IVE_STORAGE_ROOT", "")
+
+# S3 parquet 읽기 방식: mirror(로컬 디스크 미러, 기본) / stream(ranged GET)
+PARQUET_SOURCE = os.environ.get("IVE_PARQUET_SOURCE", "mirror")
+
+IPC_SUFFIX = ".arrow"
+
+
+def is_missing(error):
+    # 백엔드와 무관하게 "키 없음" 판별
+    if isinstance(error, FileNotFoundError):
+        return True
+    return isinstance(error, ClientError) and is_missing_object(error)
+
+
+def _read_parquet(path, columns):
+    with metrics.timer("parquet_read"):
+        return pq.read_table(path, columns=columns)
+
+
+# =============================================================================
+# Arrow IPC 파일 (메모리 매핑)
+# =============================================================================
+
+def version_tag(version):
+    # 파일 이름에 넣는 버전 해시
+    return hashlib.sha1(str(version).encode('utf-8')).hexdigest()[:16]
+
+
+def remove_stale_ipc(base_path, current_path):
+    # {base_path}.{버전 해시}.arrow 중 현재 버전 외 삭제 (이미 매핑한 프로세스는 그대로 읽을 수 있음)
+    for path in glob.glob(glob.escape(base_path) + ".*" + IPC_SUFFIX):
+        if path != current_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def write_ipc_file(table, path):
+    # 임시 파일에 쓴 뒤 os.replace -> 읽는 쪽은 항상 완성된 파일만 본다
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    os.close(fd)
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def map_ipc_file(path, columns=None):
+    # 압축하지 않은 IPC 파일은 버퍼가 매핑된 페이지를 그대로 가리킨다 (zero-copy)
+    with metrics.timer("ipc_map"):
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    return table.select(columns) if columns else table
+
+
+# =============================================================================
+# 백엔드
+# =============================================================================
+
+class S3Storage:
+
+    name = "s3"
+
+    def __init__(self, bucket=BUCKET_NAME, mirror=None, stream=False):
+        self.bucket = bucket
+        if mirror is None:
+            mirror = disk_mirror if bucket == disk_mirror.bucket else S3DiskMirror(disk_mirror.root, bucket)
+        self.mirror = mirror
+        self.stream = stream
+
+    def location(self, key):
+        return f"s3://{self.bucket}/{key}"
+
+    def path(self, key):
+        return self.mirror.fetch(key)
+
+    def read_table(self, key, columns=None):
+        # stream: 로컬 사본 없이 필요한 컬럼 / row group 만 ranged GET
+        if self.stream:
+            table, etag = read_parquet_streaming(key, columns=columns, bucket=self.bucket)
+            self.remember(key, etag)
+            return table, etag
+
+        path = self.mirror.fetch(key)
+        return _read_parquet(path, columns), self.mirror.cached_etag(key)
+
+    def version(self, key):
+        return self.mirror.remote_etag(key)
+
+    def cached_version(self, key):
+        return self.mirror.cached_etag(key)
+
+    def remember(self, key, version):
+        self.mirror.remember(key, version)
+
+    def put(self, key, body, content_type=None):
+        extra = {'ContentType': content_type} if content_type else {}
+        get_s3_client().put_object(Bucket=self.bucket, Key=key, Body=body, **extra)
+
+    def arrow_filesystem(self):
+        return PyFileSystem(FSSpecHandler(get_s3fs())), self.bucket
+
+    def key_of(self, path):
+        return path[len(self.bucket) + 1:]
+
+
+class LocalStorage:
+    # 버전은 mtime(ns) + 크기 - 파일을 교체하면 바뀐다
+
+    name = "local"
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def location(self, key):
+        return self.path_of(key)
+
+    def path_of(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def path(self, key):
+        path = self.path_of(key)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(path)
+        self.remember(key, self.version(key))
+        return path
+
+    def read_table(self, key, columns=None):
+        path = self.path(key)
+        return _read_parquet(path, columns), self.cached_version(key)
+
+    def version(self, key):
+        stat = os.stat(self.path_of(key))
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def cached_version(self, key):
+        with self._lock:
+            if key in self._versions:
+                return self._versions[key]
+        try:
+            return self.version(key)
+        except FileNotFoundError:
+            return None
+
+    def remember(self, key, version):
+        with self._lock:
+            self._versions[key] = version
+
+    def put(self, key, body, content_type=None):
+        path = self.path_of(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def arrow_filesystem(self):
+        return LocalFileSystem(), self.root
+
+    def key_of(self, path):
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+
+class MappedArrowStorage(LocalStorage):
+    # parquet 키를 읽을 때 {key}.{버전 해시}.arrow (비압축 IPC) 를 메모리 매핑
+    # 해당 버전의 IPC 파일이 없으면 한 번 변환해서 저장 (mtime 을 보존한 교체도 크기가 다르면 새 버전)
+
+    name = "arrow"
+
+    def ipc_path(self, key, version):
+        return f"{self.path_of(key)}.{version_tag(version)}{IPC_SUFFIX}"
+
+    def read_table(self, key, columns=None):
+        path = self.path(key)
+        version = self.cached_version(key)
+        ipc_path = self.ipc_path(key, version)
+
+        if not os.path.exists(ipc_path):
+            with metrics.timer("ipc_convert", key=key):
+                write_ipc_file(pq.read_table(path), ipc_path)
+            remove_stale_ipc(path, ipc_path)
+
+        return map_ipc_file(ipc_path, columns), version
+
+
+def create_storage(backend=STORAGE_BACKEND, root=STORAGE_ROOT):
+    if backend == "s3":
+        return S3Storage(
+            bucket=get_secret("IVE_S3_BUCKET", BUCKET_NAME),
+            stream=PARQUET_SOURCE == "stream"
+        )
+    if not root:
+        raise ValueError(f"IVE_STORAGE={backend} 는 IVE_STORAGE_ROOT 가 필요합니다")
+    if backend == "local":
+        return LocalStorage(root)
+    if backend == "arrow":
+        return MappedArrowStorage(root)
+    raise ValueError(f"알 수 없는 저장소 백엔드: {backend}")
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage()
+    return _storage
+
+
+def set_storage(storage):
+    # 다른 백엔드 주입 (벤치마크 / 오프라인 실행용), None 이면 환경 변수 기준으로 다시 생성
+    global _storage
+    with _storage_lock:
+        _storage = storage
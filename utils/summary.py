@@ -0,0 +1,122 @@
+# =============================================================================
+# 클러스터 요약 통계 사이드카 (홈 페이지용)
+# =============================================================================
+# IVE_ANALYTICS_CLUSTER_{n}_summary.json
+#   - KPI 평균 (1000_W_EFFICIENCY, CVR, TIME_TURN), describe(), 수치형 corr()
+#   - 만든 원본 데이터의 ETag 를 함께 기록해서 원본이 바뀌면 다시 계산
+# 1) 배치(jobs/build_summaries.py)가 저장소에 올린 사이드카를 우선 사용
+# 2) 없거나 오래되었으면 첫 조회 시 계산해서 로컬 디스크에 저장
+
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.cache import cluster_cache
+from utils.data_loader import cluster_version, current_data_version, fetch_df_versioned, get_df
+from utils.disk_cache import atomic_write_text, disk_mirror
+from utils.keys import cluster_summary_key
+from utils.storage import get_storage, is_missing
+
+SUMMARY_VERSION = 1
+
+
+def _mean(series):
+    value = series.mean()
+    return None if pd.isna(value) else float(value)
+
+
+def _frame_to_dict(frame):
+    # JSON 에 NaN 이 들어가지 않도록 None 으로 변환
+    values = [[None if isinstance(v, float) and math.isnan(v) else v for v in row]
+              for row in frame.astype(float).values.tolist()]
+    return {"index": list(frame.index), "columns": list(frame.columns), "data": values}
+
+
+def compute_summary(df, data_etag=None):
+    numeric_df = df.select_dtypes(include=[np.number])
+    return {
+        "version": SUMMARY_VERSION,
+        "data_etag": data_etag,
+        "rows": int(len(df)),
+        "kpi": {
+            "eff_mean": _mean(df['1000_W_EFFICIENCY']),
+            "cvr_mean": _mean(df['CVR']),
+            "time_turn_mean": _mean(df['TIME_TURN']),
+        },
+        "describe": _frame_to_dict(df.describe()) if len(numeric_df.columns) else None,
+        "corr": _frame_to_dict(numeric_df.corr()) if len(numeric_df.columns) else None,
+    }
+
+
+def summary_frame(summary, name):
+    # 사이드카의 describe / corr -> DataFrame
+    data = summary.get(name)
+    if data is None:
+        return pd.DataFrame()
+    return pd.DataFrame(data['data'], index=data['index'], columns=data['columns'], dtype=float)
+
+
+def _local_summary_path(cluster_n):
+    return os.path.join(disk_mirror.root, "summaries", f"cluster_{cluster_n}.json")
+
+
+def _read_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _is_current(summary, data_etag):
+    return (
+        summary is not None
+        and summary.get("version") == SUMMARY_VERSION
+        and summary.get("data_etag") == data_etag
+    )
+
+
+def _build_summary(cluster_n, data_etag):
+    # 저장소 사이드카
+    try:
+        summary = _read_json(get_storage().path(cluster_summary_key(cluster_n)))
+        if _is_current(summary, data_etag):
+            return summary
+    except Exception as e:
+        if not is_missing(e):
+            raise
+
+    # 로컬에서 계산해 둔 사이드카
+    local_path = _local_summary_path(cluster_n)
+    if os.path.exists(local_path):
+        summary = _read_json(local_path)
+        if _is_current(summary, data_etag):
+            return summary
+
+    # 원본 데이터로 계산 후 로컬 저장 - 사이드카에는 실제로 계산에 쓴 프레임의 버전을 기록
+    # (공유 캐시의 프레임이 요청한 버전이 아니면 저장소에서 직접 읽는다)
+    df = get_df(cluster_n)
+    df_version = cluster_version(cluster_n)[0]
+    if df_version != data_etag:
+        df, df_version = fetch_df_versioned(cluster_n)
+    summary = compute_summary(df, df_version)
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    atomic_write_text(local_path, json.dumps(summary, ensure_ascii=False))
+    return summary
+
+
+def get_summary(cluster_n, data_etag):
+    return cluster_cache.get_or_load(
+        ("summary", cluster_n, data_etag), lambda: _build_summary(cluster_n, data_etag)
+    )
+
+
+# 홈 페이지용 (실패 시 에러 표시 후 None)
+def load_summary(cluster_n):
+    try:
+        return get_summary(cluster_n, current_data_version(cluster_n))
+
+    except Exception as e:
+        st.error(f"클러스터 {cluster_n} 요약 통계 로드 실패: {e}")
+        return None
@@ -0,0 +1,122 @@
+# =============================================================================
+# 시작 시 전체 클러스터 사전 로드 (백그라운드)
+# =============================================================================
+# main.py 에서 IVE_WARMUP=1 일 때 시작
+# - 매핑 데이터의 모든 GMM_CLUSTER 에 대해 데이터 / 모델을 공유 캐시에 적재
+# - 첫 렌더링을 막지 않도록 데몬 스레드 + 제한된 스레드 풀에서 실행
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.data_loader import get_df, get_mapping_index, get_model
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+
+
+class WarmupProgress:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = None
+        self.done = 0
+        self.failed = 0
+        self.errors = {}
+        self.started_at = time.time()
+        self.finished_at = None
+
+    def set_total(self, total):
+        with self._lock:
+            self.total = total
+
+    def record(self, cluster_n, error=None):
+        with self._lock:
+            self.done += 1
+            if error is not None:
+                self.failed += 1
+                self.errors[cluster_n] = str(error)
+
+    def finish(self, error=None):
+        with self._lock:
+            if error is not None:
+                self.errors['mapping'] = str(error)
+            self.finished_at = time.time()
+
+    def snapshot(self):
+        with self._lock:
+            end = self.finished_at or time.time()
+            return {
+                "total": self.total,
+                "done": self.done,
+                "failed": self.failed,
+                "complete": self.finished_at is not None,
+                "elapsed_sec": round(end - self.started_at, 2),
+                "errors": dict(self.errors),
+            }
+
+
+_progress = None
+_start_lock = threading.Lock()
+
+
+def warmup_enabled():
+    return os.environ.get("IVE_WARMUP", "0") == "1"
+
+
+def warm_cluster(cluster_n):
+    get_df(cluster_n)
+    model = get_model(cluster_n)
+    # 네이티브 번들은 지연 로드 - 첫 요청이 역직렬화 비용을 내지 않도록 여기서 함께 로드
+    if hasattr(model, 'load_all'):
+        model.load_all()
+
+
+def _run(progress, max_workers):
+    try:
+        clusters = get_mapping_index().clusters
+    except Exception as e:
+        logger.warning("warm-up: 매핑 데이터 로드 실패: %s", e)
+        progress.finish(error=e)
+        return
+
+    progress.set_total(len(clusters))
+
+    def task(cluster_n):
+        try:
+            warm_cluster(cluster_n)
+            progress.record(cluster_n)
+        except Exception as e:
+            logger.warning("warm-up: 클러스터 %s 로드 실패: %s", cluster_n, e)
+            progress.record(cluster_n, error=e)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ive-warmup") as pool:
+        list(pool.map(task, clusters))
+
+    progress.finish()
+    logger.info("warm-up 완료: %s", progress.snapshot())
+
+
+def start_warmup(max_workers=None):
+    # 프로세스당 한 번만 시작 (이후 호출은 기존 진행 상황 반환)
+    global _progress
+    with _start_lock:
+        if _progress is not None:
+            return _progress
+
+        if max_workers is None:
+            max_workers = int(os.environ.get("IVE_WARMUP_WORKERS", DEFAULT_WORKERS))
+
+        _progress = WarmupProgress()
+        threading.Thread(
+            target=_run, args=(_progress, max_workers),
+            name="ive-warmup", daemon=True
+        ).start()
+        return _progress
+
+
+def warmup_status():
+    return None if _progress is None else _progress.snapshot()